@@ -59,9 +59,27 @@ PLAYERS_BASEDIR_TEMPLATES = 'special://home/addons/plugin.video.themoviedb.helpe
 PLAYERS_PRIORITY = 1000
 PLAYERS_REQUIRED_IDS = ['{imdb}', '{tvdb}', '{trakt}', '{slug}', '{eptvdb}' '{epimdb}', '{eptrakt}', '{epslug}', '{epid}']
 PLAYERS_CHOSEN_DEFAULTS_FILENAME = 'player_defaults'
+PLAYERS_REGISTRY_FILENAME = 'player_registry'
+PLAYERS_REGISTRY_VERSION = 1
 
 NO_LABEL_FORMATTING = ['details', 'upcoming', 'trakt_calendar', 'trakt_myairing', 'trakt_anticipated', 'library_nextaired', 'library_airingnext', 'trakt_airingnext', 'videos', 'trakt_watchlist_anticipated']
 
+WIDGET_STALE_FRESH = 600  # Seconds a stored widget list is served before it is refreshed in the background
+WIDGET_STALE_LIMITS = {  # Maximum hours a list can be served stale if lower than user setting
+    'trakt_upnext': 1,
+    'trakt_nextepisodes': 1,
+    'trakt_inprogress': 1,
+    'trakt_ondeck': 1,
+    'trakt_towatch': 1,
+    'trakt_calendar': 6,
+    'library_nextaired': 6}
+
+UPNEXT_TABLE_MAXSTALE = 3600  # Seconds after expiry that a stored next episodes table can still be served stale
+
+WIDGET_PREWARM_LIMIT = 10  # Maximum widget paths pre-warmed by service each poll
+WIDGET_PREWARM_BUDGET = 60  # Maximum seconds spent pre-warming widget paths each poll
+WIDGET_PREWARM_ACTIVE = 86400  # Seconds since last load before widget path is no longer pre-warmed
+
 PARAM_WIDGETS_RELOAD = 'reload=$INFO[Window(Home).Property(TMDbHelper.Widgets.Reload)]'
 PARAM_WIDGETS_RELOAD_FORCED = 'reload=$INFO[System.Time(hh:mm:ss)]'
 
@@ -856,3 +874,11 @@ ROUTE_TMDBID = {
         'module_name': 'tmdbhelper.lib.api.trakt.lists',
         'import_attr': 'ListUpNext'}},
 }
+
+REQUEST_RATE_LIMITS = {  # Requests per second and burst size allowed per host within this process
+    'api.trakt.tv': (1000 / 300, 1000),  # Full 5 minute window -- X-Ratelimit remaining shrinks it across processes
+    'api.themoviedb.org': (40, 40)}
+REQUEST_RATE_RESERVE = 0.25  # Fraction of burst tokens background requests leave for foreground requests
+REQUEST_RATE_RETRIES = 2  # Times a request is retried after a 429 response
+REQUEST_RATE_MAX_WAIT = 60  # Maximum seconds a request waits for a token or Retry-After before giving up
+REQUEST_REVALIDATE_HOSTS = ['api.themoviedb.org', 'api.trakt.tv']  # Hosts where expired requests are revalidated with ETag
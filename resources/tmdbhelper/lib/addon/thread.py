@@ -4,7 +4,8 @@ from tmdbhelper.lib.addon.plugin import get_setting, encode_url
 from tmdbhelper.lib.addon.logger import kodi_log
 from tmdbhelper.lib.addon.tmdate import set_timestamp, get_timestamp
 from jurialmunkey.window import get_property
-import jurialmunkey.thread as jurialmunkey_thread
+from threading import Thread, Condition, Lock, local
+from collections import deque
 
 
 def has_property_lock(property_name, timeout=5, polling=0.05):
@@ -38,9 +39,157 @@ def use_thread_lock(property_name, timeout=10, polling=0.05, combine_name=False)
     return decorator
 
 
-class ParallelThread(jurialmunkey_thread.ParallelThread):
-    thread_max = get_setting('max_threads', mode='int')
+REQUEST_PRIORITY = local()  # Thread local flag for requests made on behalf of background prefetching
 
-    @staticmethod
-    def kodi_log(msg, level=0):
-        kodi_log(msg, level)
+
+def is_background_thread():
+    return getattr(REQUEST_PRIORITY, 'background', False)
+
+
+class BackgroundPriority():
+    def __init__(self, background=True):
+        """ ContextManager to mark requests made in this thread as background so foreground requests go first """
+        self._background = background
+
+    def __enter__(self):
+        self._previous = is_background_thread()
+        REQUEST_PRIORITY.background = self._background
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        REQUEST_PRIORITY.background = self._previous
+
+
+WORKER_POOL_MAX = 50  # Cap on shared workers when max_threads setting is unlimited
+WORKER_IDLE_TIME = 2  # Seconds an idle worker waits for new work before exiting
+
+
+class WorkerPool():
+    def __init__(self, thread_max=0):
+        """
+        Process-wide pool of worker threads shared by every ParallelThread batch
+        Workers take tasks from the oldest batch with work and the owner of a batch runs its own remaining tasks
+        so that nested batches never need threads beyond the cap
+        """
+        self.thread_max = thread_max or WORKER_POOL_MAX
+        self.batches = deque()
+        self.lock = Lock()
+        self.condition = Condition(self.lock)  # Notified when new tasks are submitted
+        self.finished = Condition(self.lock)  # Notified when a task finishes
+        self.workers = 0
+        self.idle = 0
+        self.metrics = {}
+
+    @property
+    def queue_depth(self):
+        return sum(len(i.pending) for i in self.batches)
+
+    def has_pending(self):
+        return any(i.pending for i in self.batches)
+
+    def submit(self, batch):
+        with self.lock:
+            self.batches.append(batch)
+            spawn = min(len(batch.pending) - self.idle, self.thread_max - self.workers)
+            for _ in range(max(spawn, 0)):
+                self.workers += 1
+                Thread(target=self._worker, daemon=True).start()
+            self.condition.notify(len(batch.pending))
+
+    def _claim(self):
+        """ Claim next task from oldest batch with pending work -- must hold lock """
+        while self.batches:
+            task = self.batches[0].claim()
+            if task is not None:
+                return task
+            self.batches.popleft()
+
+    def _worker(self):
+        while True:
+            with self.lock:
+                task = self._claim()
+                if task is None:
+                    self.idle += 1
+                    self.condition.wait_for(self.has_pending, WORKER_IDLE_TIME)
+                    self.idle -= 1
+                    task = self._claim()
+                if task is None:
+                    self.workers -= 1
+                    return
+            batch, x = task
+            batch.run(x)
+
+    def set_metrics(self, name, depth, count, latency):
+        """ Keep queue depth at submit and total batch latency for each call site """
+        metrics = self.metrics.setdefault(name, {'calls': 0, 'items': 0, 'depth': 0, 'latency': 0})
+        metrics['calls'] += 1
+        metrics['items'] += count
+        metrics['depth'] = max(metrics['depth'], depth)
+        metrics['latency'] += latency
+        return metrics
+
+
+WORKER_POOL = WorkerPool(get_setting('max_threads', mode='int'))
+
+
+class ParallelThread():
+    log_metrics = get_setting('timer_reports')
+
+    def __init__(self, items, func, *args, **kwargs):
+        """ ContextManager for running items through func in shared worker pool alongside another function
+        with ParallelThread(items, func, *args, **kwargs) as pt:
+            pass
+            item_queue = pt.queue
+        item_queue[x]  # to get returned items after exiting context
+        """
+        from time import monotonic
+        self._func, self._args, self._kwargs = func, args, kwargs
+        self._items = list(items)
+        self._name = getattr(func, '__qualname__', f'{func}')
+        self._timer = monotonic()
+        self._running = 0
+        self._background = is_background_thread()  # Workers inherit priority of thread that submitted batch
+        self.queue = [None] * len(self._items)
+        self.pending = deque(range(len(self._items)))
+        with WORKER_POOL.lock:
+            self._depth = WORKER_POOL.queue_depth
+        if self.pending:
+            WORKER_POOL.submit(self)
+
+    def claim(self):
+        """ Pop next item index to run or None if all claimed -- must hold pool lock """
+        if not self.pending:
+            return
+        self._running += 1
+        return (self, self.pending.popleft())
+
+    def run(self, x):
+        try:
+            with BackgroundPriority(self._background):
+                self.queue[x] = self._func(self._items[x], *self._args, **self._kwargs)
+        except Exception as exc:
+            kodi_log(f'ParallelThread: {self._name} {exc}', 1)
+        with WORKER_POOL.lock:
+            self._running -= 1
+            WORKER_POOL.finished.notify_all()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        from time import monotonic
+        monitor = Monitor()
+        while not monitor.abortRequested():
+            with WORKER_POOL.lock:
+                task = self.claim()
+                if task is None and not self._running:
+                    break
+                if task is None:
+                    WORKER_POOL.finished.wait(0.1)  # Our remaining items are running in other workers
+                    continue
+            self.run(task[1])  # Run our own remaining items rather than wait for a free worker
+        del monitor
+        with WORKER_POOL.lock:
+            metrics = WORKER_POOL.set_metrics(self._name, self._depth, len(self.queue), monotonic() - self._timer)
+        if self.log_metrics:
+            kodi_log(f'ParallelThread: {self._name} {metrics}', 1)
@@ -2,6 +2,10 @@
 import datetime
 import time
 import jurialmunkey.tmdate as jurialmunkey_tmdate
+from functools import lru_cache
+
+
+PARSE_CACHE_SIZE = 8192
 
 
 get_timestamp = jurialmunkey_tmdate.get_timestamp
@@ -56,16 +60,14 @@ def format_date(time_str, str_fmt="%A", time_fmt="%Y-%m-%d", time_lim=10, utc_co
 
 
 def date_in_range(date_str, days=1, start_date=0, date_fmt="%Y-%m-%dT%H:%M:%S", date_lim=19, utc_convert=False):
-    date_a = datetime.date.today() + datetime.timedelta(days=start_date)
-    if not date_a:
+    """ Checks date_str is within days of start_date relative to today by comparing day numbers """
+    if not date_str:
         return
-    date_z = date_a + datetime.timedelta(days=days)
-    if not date_z:
+    date_a = datetime.date.today().toordinal() + start_date
+    date_z = date_a + days
+    mydate = get_day_number(date_str, date_fmt, date_lim, utc_convert=utc_convert)
+    if mydate is None:
         return
-    mydate = convert_timestamp(date_str, date_fmt, date_lim, utc_convert=utc_convert)
-    if not mydate:
-        return
-    mydate = mydate.date()
     if mydate >= date_a and mydate < date_z:
         return date_str
 
@@ -135,24 +137,27 @@ def get_calendar_name(startdate=0, days=1):
             return get_localized(32327)  # Last Month
 
 
-def convert_timestamp(time_str, time_fmt="%Y-%m-%dT%H:%M:%S", time_lim=19, utc_convert=False):
+@lru_cache(maxsize=1)
+def _get_utc_offset(hour=None):
+    """ UTC offset in hours -- hour arg only refreshes cached offset hourly in case DST changes """
+    utc_offset = -time.timezone // 3600
+    utc_offset += 1 if time.localtime().tm_isdst > 0 else 0
+    return utc_offset
+
+
+def get_utc_offset():
+    return _get_utc_offset(int(time.time()) // 3600)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_timestamp(time_str, time_fmt="%Y-%m-%dT%H:%M:%S"):
+    """ Parses time_str once -- datetime objects are immutable so the same object can be shared by callers """
     from tmdbhelper.lib.addon.logger import kodi_log
-    if not time_str:
-        return
-    time_str = time_str[:time_lim] if time_lim else time_str
-    utc_offset = 0
-    if utc_convert:
-        utc_offset = -time.timezone // 3600
-        utc_offset += 1 if time.localtime().tm_isdst > 0 else 0
     try:
-        time_obj = datetime.datetime.strptime(time_str, time_fmt)
-        time_obj = time_obj + datetime.timedelta(hours=utc_offset)
-        return time_obj
+        return datetime.datetime.strptime(time_str, time_fmt)
     except TypeError:
         try:
-            time_obj = datetime.datetime(*(time.strptime(time_str, time_fmt)[0:6]))
-            time_obj = time_obj + datetime.timedelta(hours=utc_offset)
-            return time_obj
+            return datetime.datetime(*(time.strptime(time_str, time_fmt)[0:6]))
         except Exception as exc:
             kodi_log(exc, 1)
             return
@@ -161,6 +166,36 @@ def convert_timestamp(time_str, time_fmt="%Y-%m-%dT%H:%M:%S", time_lim=19, utc_c
         return
 
 
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_day_number(time_str, time_fmt="%Y-%m-%dT%H:%M:%S", utc_offset=0):
+    time_obj = _parse_timestamp(time_str, time_fmt)
+    if not time_obj:
+        return
+    if utc_offset:
+        time_obj = time_obj + datetime.timedelta(hours=utc_offset)
+    return time_obj.toordinal()
+
+
+def get_day_number(time_str, time_fmt="%Y-%m-%dT%H:%M:%S", time_lim=19, utc_convert=False):
+    """ Returns proleptic Gregorian day number of time_str for integer comparison with date.today().toordinal() """
+    if not time_str:
+        return
+    time_str = time_str[:time_lim] if time_lim else time_str
+    return _parse_day_number(time_str, time_fmt, get_utc_offset() if utc_convert else 0)
+
+
+def convert_timestamp(time_str, time_fmt="%Y-%m-%dT%H:%M:%S", time_lim=19, utc_convert=False):
+    if not time_str:
+        return
+    time_str = time_str[:time_lim] if time_lim else time_str
+    time_obj = _parse_timestamp(time_str, time_fmt)
+    if not time_obj:
+        return
+    if not utc_convert:
+        return time_obj
+    return time_obj + datetime.timedelta(hours=get_utc_offset())
+
+
 def age_difference(birthday, deathday=None):
     try:  # Added Error Checking as strptime doesn't work correctly on LibreElec
         deathday = convert_timestamp(deathday, '%Y-%m-%d', 10) if deathday else datetime.datetime.now()
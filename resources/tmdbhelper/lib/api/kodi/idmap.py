@@ -0,0 +1,106 @@
+from tmdbhelper.lib.addon.consts import CACHE_EXTENDED
+from tmdbhelper.lib.addon.thread import use_thread_lock
+from tmdbhelper.lib.files.bcache import BasicCache
+
+
+LIBRARY_ID_MAP = 'LibraryIDMap.db'
+LIBRARY_ID_MAP_LOCK = 'LibraryIDMap.Locked'
+LIBRARY_ID_KEYS = (('imdb_id', 'imdb'), ('tvdb_id', 'tvdb'), ('dbid', 'dbid'))  # External ids checked before dbid
+
+
+class LibraryIDMap():
+    def __init__(self, tmdb_type, tmdb_api=None, cache=None):
+        """
+        Persistent map of Kodi library dbid / imdb / tvdb ids to TMDb ids for library seeded lists
+        Filled by service when the library version changes and by lists whenever they resolve an id themselves
+        Items which could not be resolved are mapped to 0 so they are only retried after the next library change
+        """
+        self.tmdb_type = tmdb_type
+        self.cache_name = f'idmap.{tmdb_type}'
+        self._tmdb_api = tmdb_api
+        self._cache = cache or BasicCache(filename=LIBRARY_ID_MAP)
+        self._updates = {}  # Ids set since load which are merged into stored map on save
+        self._removed = set()  # Ids dropped by refresh since load
+        self._version = None  # Library version set by refresh since load
+
+    @property
+    def tmdb_api(self):
+        if not self._tmdb_api:
+            from tmdbhelper.lib.api.tmdb.api import TMDb
+            self._tmdb_api = TMDb()
+        return self._tmdb_api
+
+    @property
+    def data(self):
+        try:
+            return self._data
+        except AttributeError:
+            self._data = self._cache.get_cache(self.cache_name) or {'version': None, 'ids': {}}
+            return self._data
+
+    @staticmethod
+    def get_keys(item):
+        return [f'{prefix}.{item[k]}' for k, prefix in LIBRARY_ID_KEYS if item.get(k)]
+
+    def get_tmdb_id(self, item):
+        """ Returns TMDb id from item uniqueid or map. Returns 0 if known to be unresolved or None if not yet tried """
+        if item.get('tmdb_id'):
+            return item['tmdb_id']
+        ids = self.data['ids']
+        for k in self.get_keys(item):
+            if k in ids:
+                return ids[k]
+
+    def set_tmdb_id(self, item, tmdb_id):
+        for k in self.get_keys(item):
+            if self.data['ids'].get(k) == (tmdb_id or 0):
+                continue
+            self.data['ids'][k] = self._updates[k] = tmdb_id or 0
+        return tmdb_id
+
+    def get_resolved(self, items):
+        """ Returns copies of items with TMDb id from map added where it was missing """
+        return [{**i, 'tmdb_id': self.get_tmdb_id(i)} if not i.get('tmdb_id') else i for i in items]
+
+    def resolve(self, items):
+        """ Look up TMDb ids for items not already in map and store results """
+        from tmdbhelper.lib.addon.thread import ParallelThread
+
+        def _get_tmdb_id(i):
+            return self.tmdb_api.get_tmdb_id(
+                tmdb_type=self.tmdb_type, imdb_id=i.get('imdb_id'), tvdb_id=i.get('tvdb_id'),
+                query=i.get('showtitle') or i.get('title'), year=i.get('year'))
+
+        items = [i for i in items if self.get_tmdb_id(i) is None]
+        with ParallelThread(items, _get_tmdb_id) as pt:
+            item_queue = pt.queue
+        for i, tmdb_id in zip(items, item_queue):
+            self.set_tmdb_id(i, tmdb_id)
+        self.save()
+        return len(items)
+
+    def refresh(self, database, version=None):
+        """ Rebuild map for current library -- drops removed dbids and retries items previously unresolved """
+        keys = {k for i in database for k in self.get_keys(i)}
+        ids = {k: v for k, v in self.data['ids'].items() if v and k in keys}
+        self._removed.update(k for k in self.data['ids'] if k not in ids)
+        self._version = (version, )
+        self.data['ids'] = ids
+        self.data['version'] = version
+        for i in database:
+            if i.get('tmdb_id'):
+                self.set_tmdb_id(i, i['tmdb_id'])
+        return self.resolve(database)
+
+    @use_thread_lock(LIBRARY_ID_MAP_LOCK, timeout=30, polling=0.1)
+    def save(self):
+        """ Merge our changes into the stored map so ids resolved by other lists or the service aren't lost """
+        if not self._updates and not self._removed and not self._version:
+            return
+        data = self._cache.get_cache(self.cache_name) or {'version': None, 'ids': {}}
+        ids = {k: v for k, v in data['ids'].items() if k not in self._removed}
+        ids.update(self._updates)
+        version = self._version[0] if self._version else data['version']
+        self._data = {'version': version, 'ids': ids}
+        self._cache.set_cache(self._data, self.cache_name, cache_days=CACHE_EXTENDED)
+        self._updates, self._removed, self._version = {}, set(), None
@@ -32,7 +32,9 @@ class _ItemMapper(object):
     def add_base(self, item, base_item=None, tmdb_type=None, key_blacklist=[], is_season=False):
         if not base_item:
             return item
-        for d in ['infolabels', 'infoproperties', 'art']:
+        for d in ['infolabels', 'infoproperties', 'iterprops', 'art']:
+            if d not in item:
+                continue
             for k, v in base_item.get(d, {}).items():
                 if not v or item[d].get(k) is not None:
                     continue
@@ -88,7 +90,10 @@ class _ItemMapper(object):
                     continue
                 # Map value onto item dict parent/child keys
                 for p, c in d['keys']:
-                    if c == UPDATE_BASEKEY:
+                    if c == UPDATE_BASEKEY and p is None:  # Update multiple parents from dict of {parent: dict}
+                        for parent, props in v.items():
+                            item[parent].update(props)
+                    elif c == UPDATE_BASEKEY:
                         item[p].update(v)
                     elif c is None:
                         item[p] = v
@@ -0,0 +1,124 @@
+from time import monotonic
+from threading import Lock
+from tmdbhelper.lib.addon.thread import is_background_thread
+from tmdbhelper.lib.addon.consts import REQUEST_RATE_LIMITS, REQUEST_RATE_RESERVE, REQUEST_RATE_MAX_WAIT
+
+
+RATE_LIMITERS = {}
+RATE_LIMITERS_LOCK = Lock()
+
+
+def get_rate_limiter(url):
+    """ Returns shared limiter for host of url or None if host has no configured limit """
+    from urllib.parse import urlparse
+    host = urlparse(url).netloc
+    if host not in REQUEST_RATE_LIMITS:
+        return
+    with RATE_LIMITERS_LOCK:
+        try:
+            return RATE_LIMITERS[host]
+        except KeyError:
+            RATE_LIMITERS[host] = RateLimiter(host, *REQUEST_RATE_LIMITS[host])
+            return RATE_LIMITERS[host]
+
+
+def get_retry_after(response):
+    """ Returns seconds to wait from Retry-After header of response """
+    from jurialmunkey.parser import try_float
+    try:
+        return max(try_float(response.headers.get('Retry-After')), 1)
+    except AttributeError:
+        return 1
+
+
+class RateLimiter():
+    def __init__(self, host, rate, burst):
+        """
+        Token bucket shared by threads making requests to a host
+        Background requests keep a reserve of tokens and give way while foreground requests are waiting
+        Response headers shrink the bucket when the API reports fewer remaining requests or sends a 429
+        """
+        self.host = host
+        self.rate = rate
+        self.burst = burst
+        self.reserve = burst * REQUEST_RATE_RESERVE
+        self.tokens = burst
+        self.updated = monotonic()
+        self.blocked_until = 0
+        self.foreground = 0  # Count of foreground requests currently waiting for a token
+        self.throttled = 0
+        self.retried = 0
+        self._lock = Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _get_wait(self, background=False):
+        """ Takes a token and returns 0 or returns seconds until a token is available -- call with lock held """
+        now = monotonic()
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self._refill(now)
+        reserve = self.reserve if background else 0
+        if background and self.foreground:
+            reserve = self.burst  # Foreground requests are queued so wait until they have been served
+        if self.tokens - reserve >= 1:
+            self.tokens -= 1
+            return 0
+        return max((1 + reserve - self.tokens) / self.rate, 0.05)
+
+    def acquire(self, background=None):
+        """ Blocks until a request can be made. Returns False if abort requested or wait is too long """
+        from xbmc import Monitor
+        background = is_background_thread() if background is None else background
+        timeout = monotonic() + REQUEST_RATE_MAX_WAIT
+        waiting = False
+        monitor = None
+        try:
+            while True:
+                with self._lock:
+                    wait = self._get_wait(background)
+                    if not wait:
+                        return True
+                    if not waiting:
+                        waiting = True
+                        self.throttled += 1
+                        self.foreground += 0 if background else 1
+                if monotonic() + wait > timeout:
+                    return False
+                monitor = monitor or Monitor()
+                if monitor.waitForAbort(min(wait, 1)):
+                    return False
+        finally:
+            if waiting and not background:
+                with self._lock:
+                    self.foreground -= 1
+
+    def update(self, response):
+        """ Adjusts available tokens from response status and rate limit headers """
+        if response is None:
+            return
+        if response.status_code == 429:
+            with self._lock:
+                self.blocked_until = max(self.blocked_until, monotonic() + get_retry_after(response))
+                self.tokens = 0
+                self.retried += 1
+            return
+        remaining = self.get_remaining(response)
+        if remaining is None:
+            return
+        with self._lock:
+            self.tokens = min(self.tokens, remaining)
+
+    @staticmethod
+    def get_remaining(response):
+        """ Returns remaining requests from Trakt X-Ratelimit header or None if not sent """
+        from tmdbhelper.lib.files.futils import json_loads
+        try:
+            return json_loads(response.headers['X-Ratelimit'])['remaining']
+        except (AttributeError, KeyError, TypeError):
+            return
+
+    def get_report(self):
+        return f'{self.host} throttled {self.throttled} retried {self.retried}'
@@ -1,13 +1,60 @@
 import jurialmunkey.reqapi
 from tmdbhelper.lib.addon.plugin import get_setting
 from tmdbhelper.lib.addon.logger import kodi_log
-from tmdbhelper.lib.files.bcache import BasicCache
+from tmdbhelper.lib.api.revalidate import RevalidatedCache
 
 
 class RequestAPI(jurialmunkey.reqapi.RequestAPI):
     error_notification = get_setting('connection_notifications')
-    _basiccache = BasicCache
+    _basiccache = RevalidatedCache
 
     @staticmethod
     def kodi_log(msg, level=0):
         kodi_log(msg, level)
+
+    def get_simple_api_request(self, *args, **kwargs):
+        """ Waits for a token from the host rate limiter and retries after 429 responses """
+        from tmdbhelper.lib.api.ratelimit import get_rate_limiter
+        from tmdbhelper.lib.addon.consts import REQUEST_RATE_RETRIES
+        request = args[0] if args else kwargs.get('request')
+        limiter = get_rate_limiter(request) if request else None
+        if not limiter:
+            return super().get_simple_api_request(*args, **kwargs)
+        for x in range(REQUEST_RATE_RETRIES + 1):
+            if not limiter.acquire():
+                self.kodi_log(f'RateLimiter: Gave up waiting to request\n{request}\n{limiter.get_report()}', 1)
+                return
+            response = super().get_simple_api_request(*args, **kwargs)
+            limiter.update(response)
+            if response is None or response.status_code != 429:
+                return response
+            self.kodi_log(f'RateLimiter: 429 Too Many Requests\n{request}\n{limiter.get_report()}', 1)
+        return response
+
+    def get_api_request_json(self, request=None, postdata=None, headers=None, method=None):
+        """ Revalidates expired GET requests with ETag / Last-Modified kept in their cache entry before downloading again """
+        from tmdbhelper.lib.api.revalidate import RequestValidator, is_revalidated_url
+        if postdata or method or not request or not is_revalidated_url(request):
+            return super().get_api_request_json(request, postdata, headers, method)
+
+        validator = RequestValidator(request)
+        conditional_headers = validator.get_headers(headers)
+        if conditional_headers:
+            response = self.get_simple_api_request(request, headers=conditional_headers)
+            if response is not None and response.status_code == 304:
+                return validator.get_data()
+            if response is not None and response.status_code == 200:
+                return validator.set_data(response, self.get_response_data(response), conditional=True)
+
+        # No expired entry to revalidate or conditional request failed so use standard request with its error handling
+        response = self.get_api_request(request, headers=headers)
+        if not response:
+            return {}
+        return validator.set_data(response, self.get_response_data(response))
+
+    @staticmethod
+    def get_response_data(response):
+        try:
+            return response.json()
+        except ValueError:
+            return {}
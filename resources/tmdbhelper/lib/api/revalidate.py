@@ -0,0 +1,105 @@
+from threading import local
+from jurialmunkey.parser import try_int
+from jurialmunkey.window import get_property
+from tmdbhelper.lib.addon.consts import CACHE_LONG, REQUEST_REVALIDATE_HOSTS
+from tmdbhelper.lib.addon.tmdate import get_timestamp, set_timestamp
+from tmdbhelper.lib.files.bcache import BasicCache
+
+
+REQUEST_VALIDATORS = 'request.validators'
+REQUEST_REVALIDATE_COUNTER = 'Request.Revalidate.Counter'
+
+_revalidate = local()  # Hands entries between the request cache and the request made by use_cache in the same thread
+
+
+def is_revalidated_url(url):
+    from urllib.parse import urlparse
+    return urlparse(url).netloc in REQUEST_REVALIDATE_HOSTS
+
+
+def get_revalidate_report():
+    """ Returns count of expired requests revalidated/refetched and bytes not downloaded since Kodi started """
+    counts = {k: try_int(get_property(f'{REQUEST_REVALIDATE_COUNTER}.{k}')) for k in ('revalidated', 'refetched', 'saved')}
+    return f'revalidated {counts["revalidated"]} refetched {counts["refetched"]} saved {counts["saved"] // 1024}KB'
+
+
+class RevalidatedCache(BasicCache):
+    """
+    Request cache which keeps ETag / Last-Modified of revalidated requests in the same entry as their data
+    Entries are stored for CACHE_LONG but read as expired after their own cache days
+    The expired entry is then passed to the request that use_cache makes next so it can be revalidated
+    """
+
+    def get_cache(self, cache_name, *args, **kwargs):
+        data = super().get_cache(cache_name, *args, **kwargs)
+        if not isinstance(data, dict) or REQUEST_VALIDATORS not in data:
+            return data
+        if get_timestamp(data[REQUEST_VALIDATORS].get('refresh_at')):
+            return data['data']
+        _revalidate.expired = data
+        return
+
+    def set_cache(self, my_object, cache_name, cache_days=14, *args, **kwargs):
+        pending, _revalidate.pending = getattr(_revalidate, 'pending', None), None
+        if not pending or pending[0] is not my_object:
+            return super().set_cache(my_object, cache_name, cache_days, *args, **kwargs)
+        validators = {**pending[1], 'refresh_at': set_timestamp(try_int(cache_days) * 24 * 3600)}
+        entry = {REQUEST_VALIDATORS: validators, 'data': my_object}
+        super().set_cache(entry, cache_name, max(try_int(cache_days), CACHE_LONG), *args, **kwargs)
+        return my_object
+
+
+class RequestValidator():
+    def __init__(self, url):
+        """
+        ETag and Last-Modified of the expired request cache entry for a url
+        Sent as If-None-Match / If-Modified-Since so a 304 reuses the expired data without downloading it
+        """
+        self.url = url
+        self.data = getattr(_revalidate, 'expired', None)
+        _revalidate.expired = None
+        if not self.data or self.data[REQUEST_VALIDATORS].get('url') != url:
+            self.data = None  # Expired entry was for a different request (e.g. cache_only lookup) so don't use it
+
+    def get_headers(self, headers=None):
+        """ Returns request headers with conditional headers added or None if no expired entry to revalidate """
+        if not self.data or not self.data.get('data'):
+            return
+        validators = self.data[REQUEST_VALIDATORS]
+        headers = dict(headers or {})
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        return headers
+
+    def get_data(self):
+        """ Returns expired data after a 304 response and keeps its validators for the refreshed cache entry """
+        validators = self.data[REQUEST_VALIDATORS]
+        self.set_counter('revalidated')
+        self.set_counter('saved', validators.get('size') or 0)
+        self.set_pending(self.data['data'], validators)
+        return self.data['data']
+
+    def set_data(self, response, data, conditional=False):
+        """ Keeps validators from full response for the cache entry. Returns data """
+        if conditional:
+            self.set_counter('refetched')  # Only count a refetch when the conditional request didn't get a 304
+        if not data:
+            return data
+        etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return data
+        self.set_pending(data, {
+            'url': self.url, 'etag': etag, 'last_modified': last_modified,
+            'size': len(response.content or b'')})
+        return data
+
+    @staticmethod
+    def set_pending(data, validators):
+        _revalidate.pending = (data, validators)
+
+    @staticmethod
+    def set_counter(key, count=1):
+        name = f'{REQUEST_REVALIDATE_COUNTER}.{key}'
+        get_property(name, set_property=f'{try_int(get_property(name)) + count}')
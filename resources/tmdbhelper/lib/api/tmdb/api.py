@@ -10,7 +10,12 @@ ARTWORK_QUALITY = get_setting('artwork_quality', 'int')
 ARTLANG_FALLBACK = True if get_setting('fanarttv_enfallback') and not get_setting('fanarttv_secondpref') else False
 
 API_URL = 'https://api.themoviedb.org/3'
-APPEND_TO_RESPONSE = 'credits,images,release_dates,content_ratings,external_ids,movie_credits,tv_credits,keywords,reviews,videos,watch/providers'
+APPEND_TO_RESPONSE_LIST = 'credits,images,release_dates,content_ratings,external_ids,videos,watch/providers'
+APPEND_TO_RESPONSE = f'{APPEND_TO_RESPONSE_LIST},keywords,reviews,movie_credits,tv_credits'
+DETAIL_SECTIONS = {  # Only mapped to iterprops so only fetched from their own endpoints for detailed items
+    'movie': ('keywords', 'reviews'),
+    'tv': ('keywords', 'reviews'),
+    'person': ('movie_credits', 'tv_credits')}
 
 
 class TMDb(RequestAPI, TMDbMethods):
@@ -32,6 +37,8 @@ class TMDb(RequestAPI, TMDbMethods):
         self.language = language
         self.mpaa_prefix = mpaa_prefix
         self.append_to_response = APPEND_TO_RESPONSE
+        self.append_to_response_list = APPEND_TO_RESPONSE_LIST
+        self.detail_sections = DETAIL_SECTIONS
         self.page_length = max(get_setting('pagemulti_tmdb', 'int'), page_length)
         TMDb.api_key = api_key
 
@@ -39,6 +46,7 @@ class TMDb(RequestAPI, TMDbMethods):
     def req_strip(self):
         req_strip_add = [
             (self.append_to_response, ''),
+            (self.append_to_response_list, 'tier.list'),
             (self.req_language, f'{self.iso_language}{"_en" if ARTLANG_FALLBACK else ""}')
         ]
         try:
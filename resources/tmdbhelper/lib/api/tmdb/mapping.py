@@ -126,6 +126,7 @@ def get_iter_props(v, base_name, *args, **kwargs):
 
 def get_providers(v, allowlist=None):
     infoproperties = {}
+    iterprops = {}
     infoproperties['provider.link'] = v.pop('link', None)
     newlist = (
         dict(i, **{'key': key}) for key, value in v.items() if isinstance(value, list)
@@ -140,18 +141,18 @@ def get_providers(v, allowlist=None):
         # If provider already added just update type
         if i['provider_name'] in added:
             idx = f'provider.{added.index(i["provider_name"]) + 1}.type'
-            infoproperties[idx] = f'{infoproperties.get(idx)} / {i.get("key")}'
+            iterprops[idx] = f'{iterprops.get(idx)} / {i.get("key")}'
             continue
         # Add item provider
         x = len(added) + 1
-        infoproperties.update({
+        iterprops.update({
             f'provider.{x}.id': i.get('provider_id'),
             f'provider.{x}.type': i.get('key'),
             f'provider.{x}.name': i['provider_name'],
             f'provider.{x}.icon': get_imagepath_logo(i.get('logo_path'))})
         added_append(i['provider_name'])
     infoproperties['providers'] = ' / '.join(added)
-    return infoproperties
+    return {'infoproperties': infoproperties, 'iterprops': iterprops}
 
 
 def get_trailer(v, iso_639_1=None):
@@ -180,16 +181,17 @@ def get_external_ids(v):
 
 def get_roles(v, key='character'):
     infoproperties = {}
+    iterprops = {}
     episode_count = 0
     for x, i in enumerate(sorted(v, key=lambda d: d.get('episode_count', 0)), start=1):
         episode_count += i.get('episode_count') or 0
-        infoproperties[f'{key}.{x}.name'] = i.get(key)
-        infoproperties[f'{key}.{x}.episodes'] = i.get('episode_count')
-        infoproperties[f'{key}.{x}.id'] = i.get('credit_id')
+        iterprops[f'{key}.{x}.name'] = i.get(key)
+        iterprops[f'{key}.{x}.episodes'] = i.get('episode_count')
+        iterprops[f'{key}.{x}.id'] = i.get('credit_id')
     else:
         infoproperties['episodes'] = episode_count
-        infoproperties[key] = infoproperties['role'] = infoproperties[f'{key}.1.name']
-    return infoproperties
+        infoproperties[key] = infoproperties['role'] = iterprops[f'{key}.1.name']
+    return {'infoproperties': infoproperties, 'iterprops': iterprops}
 
 
 def get_extra_art(v):
@@ -447,27 +449,27 @@ class ItemMapper(_ItemMapper):
                 'func': lambda v: f'${v:0,.0f}'
             }],
             'spoken_languages': [{
-                'keys': [('infoproperties', UPDATE_BASEKEY)],
+                'keys': [('iterprops', UPDATE_BASEKEY)],
                 'func': iter_props,
                 'args': ['language'],
                 'kwargs': {'name': 'name', 'iso': 'iso_639_1'}
             }],
             'keywords': [{
-                'keys': [('infoproperties', UPDATE_BASEKEY)],
+                'keys': [('iterprops', UPDATE_BASEKEY)],
                 'subkeys': ['keywords'],
                 'func': iter_props,
                 'args': ['keyword'],
                 'kwargs': {'name': 'name', 'tmdb_id': 'id'}
             }],
             'reviews': [{
-                'keys': [('infoproperties', UPDATE_BASEKEY)],
+                'keys': [('iterprops', UPDATE_BASEKEY)],
                 'subkeys': ['results'],
                 'func': iter_props,
                 'args': ['review'],
                 'kwargs': {'content': 'content', 'author': 'author', 'tmdb_id': 'id'}
             }],
             'created_by': [{
-                'keys': [('infoproperties', UPDATE_BASEKEY)],
+                'keys': [('iterprops', UPDATE_BASEKEY)],
                 'func': get_iter_props,
                 'args': ['creator'],
                 'kwargs': {
@@ -482,7 +484,7 @@ class ItemMapper(_ItemMapper):
                 'func': lambda v: ' / '.join([x for x in v or [] if x])
             }],
             'known_for': [{
-                'keys': [('infoproperties', UPDATE_BASEKEY)],
+                'keys': [('iterprops', UPDATE_BASEKEY)],
                 'func': iter_props,
                 'args': ['known_for'],
                 'kwargs': {'title': 'title', 'tmdb_id': 'id', 'rating': 'vote_average', 'tmdb_type': 'media_type'}}, {
@@ -491,12 +493,12 @@ class ItemMapper(_ItemMapper):
                 'func': lambda v: ' / '.join([x['title'] for x in v or [] if x.get('title')])
             }],
             'roles': [{
-                'keys': [('infoproperties', UPDATE_BASEKEY)],
+                'keys': [(None, UPDATE_BASEKEY)],
                 'func': get_roles,
                 'kwargs': {'key': 'character'}
             }],
             'jobs': [{
-                'keys': [('infoproperties', UPDATE_BASEKEY)],
+                'keys': [(None, UPDATE_BASEKEY)],
                 'func': get_roles,
                 'kwargs': {'key': 'job'}
             }],
@@ -512,12 +514,12 @@ class ItemMapper(_ItemMapper):
                 'keys': [('infolabels', UPDATE_BASEKEY)],
                 'func': get_credits}, {
                 # ---
-                'keys': [('infoproperties', UPDATE_BASEKEY)],
+                'keys': [('iterprops', UPDATE_BASEKEY)],
                 'subkeys': ['crew'],
                 'func': get_crew_properties
             }],
             'parts': [{
-                'keys': [('infoproperties', UPDATE_BASEKEY)],
+                'keys': [(None, UPDATE_BASEKEY)],
                 'func': self.get_collection_properties
             }],
             'movie_credits': [{
@@ -530,7 +532,7 @@ class ItemMapper(_ItemMapper):
                 'keys': [('infoproperties', 'numitems.tmdb.movies.total')],
                 'func': lambda v: len(v.get('cast') or []) + len(v.get('crew') or [])}, {
                 # ---
-                'keys': [('infoproperties', UPDATE_BASEKEY)],
+                'keys': [('iterprops', UPDATE_BASEKEY)],
                 'subkeys': ['cast'],
                 'func': get_iter_props,
                 'args': ['movie.cast'],
@@ -540,7 +542,7 @@ class ItemMapper(_ItemMapper):
                     'image_keys': {'poster': 'poster_path'},
                     'fanart_keys': {'fanart': 'backdrop_path'}}}, {
                 # ---
-                'keys': [('infoproperties', UPDATE_BASEKEY)],
+                'keys': [('iterprops', UPDATE_BASEKEY)],
                 'subkeys': ['crew'],
                 'func': get_iter_props,
                 'args': ['movie.crew'],
@@ -560,7 +562,7 @@ class ItemMapper(_ItemMapper):
                 'keys': [('infoproperties', 'numitems.tmdb.tvshows.total')],
                 'func': lambda v: len(v.get('cast') or []) + len(v.get('crew') or [])}, {
                 # ---
-                'keys': [('infoproperties', UPDATE_BASEKEY)],
+                'keys': [('iterprops', UPDATE_BASEKEY)],
                 'subkeys': ['cast'],
                 'func': get_iter_props,
                 'args': ['tvshow.cast'],
@@ -570,7 +572,7 @@ class ItemMapper(_ItemMapper):
                     'image_keys': {'poster': 'poster_path'},
                     'fanart_keys': {'fanart': 'backdrop_path'}}}, {
                 # ---
-                'keys': [('infoproperties', UPDATE_BASEKEY)],
+                'keys': [('iterprops', UPDATE_BASEKEY)],
                 'subkeys': ['crew'],
                 'func': get_iter_props,
                 'args': ['tvshow.crew'],
@@ -600,7 +602,7 @@ class ItemMapper(_ItemMapper):
                 'func': dict_to_list,
                 'args': ['name']}, {
                 # ---
-                'keys': [('infoproperties', UPDATE_BASEKEY)],
+                'keys': [('iterprops', UPDATE_BASEKEY)],
                 'func': iter_props,
                 'args': ['genre'],
                 'kwargs': {'name': 'name', 'tmdb_id': 'id'}
@@ -611,7 +613,7 @@ class ItemMapper(_ItemMapper):
                 'func': dict_to_list,
                 'args': ['name']}, {
                 # ---
-                'keys': [('infoproperties', UPDATE_BASEKEY)],
+                'keys': [('iterprops', UPDATE_BASEKEY)],
                 'func': iter_props,
                 'args': ['country'],
                 'kwargs': {'name': 'name', 'tmdb_id': 'id'}
@@ -625,7 +627,7 @@ class ItemMapper(_ItemMapper):
                 'keys': [('infoproperties', 'network')],
                 'func': lambda v: ' / '.join([x['name'] for x in v or [] if x.get('name')])}, {
                 # ---
-                'keys': [('infoproperties', UPDATE_BASEKEY)],
+                'keys': [('iterprops', UPDATE_BASEKEY)],
                 'func': get_iter_props,
                 'args': ['network'],
                 'kwargs': {
@@ -642,7 +644,7 @@ class ItemMapper(_ItemMapper):
                 'keys': [('infoproperties', 'studio')],
                 'func': lambda v: v[0].get('name') if v else ''}, {
                 # ---
-                'keys': [('infoproperties', UPDATE_BASEKEY)],
+                'keys': [('iterprops', UPDATE_BASEKEY)],
                 'func': get_iter_props,
                 'args': ['studio'],
                 'kwargs': {
@@ -651,7 +653,7 @@ class ItemMapper(_ItemMapper):
                     'negativeimage_keys': {'monoicon': 'logo_path'}}
             }],
             'watch/providers': [{
-                'keys': [('infoproperties', UPDATE_BASEKEY)],
+                'keys': [(None, UPDATE_BASEKEY)],
                 'subkeys': ['results', self.iso_country],
                 'kwargs': {'allowlist': self.provider_allowlist},
                 'func': get_providers
@@ -729,23 +731,24 @@ class ItemMapper(_ItemMapper):
     def get_collection_properties(self, v):
         ratings = []
         infoproperties = {}
+        iterprops = {}
         year_l, year_h, votes = 9999, 0, 0
         genres = set()
         for p, i in enumerate(v, start=1):
             genre = self.get_genres_by_id(i.get('genre_ids'))
             genres.update(genre)
 
-            infoproperties[f'set.{p}.genre'] = ' / '.join(genre)
-            infoproperties[f'set.{p}.title'] = i.get('title', '')
-            infoproperties[f'set.{p}.tmdb_id'] = i.get('id', '')
-            infoproperties[f'set.{p}.originaltitle'] = i.get('original_title', '')
-            infoproperties[f'set.{p}.plot'] = i.get('overview', '')
-            infoproperties[f'set.{p}.premiered'] = i.get('release_date', '')
-            infoproperties[f'set.{p}.year'] = i.get('release_date', '')[:4]
-            infoproperties[f'set.{p}.rating'] = f'{try_float(i.get("vote_average")):0,.1f}'
-            infoproperties[f'set.{p}.votes'] = i.get('vote_count', '')
-            infoproperties[f'set.{p}.poster'] = get_imagepath_poster(i.get('poster_path', ''))
-            infoproperties[f'set.{p}.fanart'] = get_imagepath_fanart(i.get('backdrop_path', ''))
+            iterprops[f'set.{p}.genre'] = ' / '.join(genre)
+            iterprops[f'set.{p}.title'] = i.get('title', '')
+            iterprops[f'set.{p}.tmdb_id'] = i.get('id', '')
+            iterprops[f'set.{p}.originaltitle'] = i.get('original_title', '')
+            iterprops[f'set.{p}.plot'] = i.get('overview', '')
+            iterprops[f'set.{p}.premiered'] = i.get('release_date', '')
+            iterprops[f'set.{p}.year'] = i.get('release_date', '')[:4]
+            iterprops[f'set.{p}.rating'] = f'{try_float(i.get("vote_average")):0,.1f}'
+            iterprops[f'set.{p}.votes'] = i.get('vote_count', '')
+            iterprops[f'set.{p}.poster'] = get_imagepath_poster(i.get('poster_path', ''))
+            iterprops[f'set.{p}.fanart'] = get_imagepath_fanart(i.get('backdrop_path', ''))
 
             year_l = min(try_int(i.get('release_date', '')[:4]), year_l)
             year_h = max(try_int(i.get('release_date', '')[:4]), year_h)
@@ -767,7 +770,7 @@ class ItemMapper(_ItemMapper):
         if genres:
             infoproperties['set.genres'] = ' / '.join(genres)
         infoproperties['set.numitems'] = p
-        return infoproperties
+        return {'infoproperties': infoproperties, 'iterprops': iterprops}
 
     def get_imagepath_quality(self, v):
         try:
@@ -826,7 +829,7 @@ class ItemMapper(_ItemMapper):
             if x <= ITER_PROPS_MAX:
                 p = f'Cast.{x}.'
                 for j in [('name', 'Name'), ('role', 'Role'), ('thumbnail', 'Thumb')]:
-                    item['infoproperties'][f'{p}{j[1]}'] = i.get(j[0], '')
+                    item['iterprops'][f'{p}{j[1]}'] = i.get(j[0], '')
             cast_prop.append(i['name'])
             cast_list.append(i)
         item['infoproperties']['cast'] = " / ".join(cast_prop)
@@ -840,12 +843,18 @@ class ItemMapper(_ItemMapper):
             item['infoproperties'][k] = v
         return item
 
-    def get_info(self, info_item, tmdb_type, base_item=None, base_is_season=False, add_infoproperties=None, **kwargs):
+    def get_info(self, info_item, tmdb_type, base_item=None, base_is_season=False, add_infoproperties=None, split_iterprops=False, **kwargs):
+        """ Map TMDb item -- indexed properties are mapped into a separate iterprops dict
+        Set split_iterprops=True to keep iterprops separate otherwise they are joined back into infoproperties
+        """
         item = get_empty_item()
+        item['iterprops'] = {}
         item = self.map_item(item, info_item)
         item = self.add_base(item, base_item, tmdb_type, key_blacklist=['year', 'premiered', 'season', 'episode'], is_season=base_is_season)
         item = self.add_cast(item, info_item, base_item)
         item = self.add_infoproperties(item, add_infoproperties)
         item = self.finalise(item, tmdb_type)
         item['params'] = get_params(info_item, tmdb_type, params=item.get('params', {}), **kwargs)
+        if not split_iterprops:
+            item['infoproperties'] = {**item.pop('iterprops'), **item['infoproperties']}
         return item
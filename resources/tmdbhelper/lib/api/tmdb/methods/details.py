@@ -180,16 +180,30 @@ def get_tvshow_nextaired(self, tmdb_id):
     return _get_formatted() if infoproperties else infoproperties
 
 
-def get_details_request(self, tmdb_type, tmdb_id, season=None, episode=None, cache_refresh=False):
+def get_details_request(self, tmdb_type, tmdb_id, season=None, episode=None, cache_refresh=False, detailed=False):
+    """ Get details with list tier sections -- detail sections are requested from their own endpoints if detailed """
     path_affix = []
     if season is not None:
         path_affix += ['season', season]
     if season is not None and episode is not None:
         path_affix += ['episode', episode]
-    return self.get_request_lc(
+
+    details = self.get_request_lc(
         tmdb_type, tmdb_id, *path_affix,
-        append_to_response=self.append_to_response, cache_refresh=cache_refresh
-    ) or {}
+        append_to_response=self.append_to_response_list, cache_refresh=cache_refresh) or {}
+
+    # Seasons and episodes don't have any detail sections so only request them for the base types that do
+    sections = self.detail_sections.get(tmdb_type) if detailed and season is None else None
+    if not details or not sections:
+        return details
+
+    def _get_section(section):
+        return (section, self.get_request_lc(tmdb_type, tmdb_id, section, cache_refresh=cache_refresh))
+
+    from tmdbhelper.lib.addon.thread import ParallelThread
+    with ParallelThread(sections, _get_section) as pt:
+        item_queue = pt.queue
+    return {**details, **{i[0]: i[1] for i in item_queue if i and i[1]}}
 
 
 def get_details(self, tmdb_type, tmdb_id, season=None, episode=None, **kwargs):
@@ -0,0 +1,175 @@
+from bisect import bisect_right
+from tmdbhelper.lib.addon.consts import CACHE_EXTENDED
+from tmdbhelper.lib.addon.tmdate import set_timestamp, get_timestamp
+from tmdbhelper.lib.addon.thread import use_thread_lock
+from tmdbhelper.lib.files.bcache import BasicCache
+
+
+AIRING_SCHEDULE = 'AiringSchedule.db'
+AIRING_SCHEDULE_LOCK = 'AiringSchedule.Locked'
+AIRING_SCHEDULE_LIMIT = 50  # Maximum due rows refreshed by service each poll
+AIRING_SCHEDULE_UNSEEN = 30  # Days after a list last seeded a tvshow that its row is dropped
+ROW_TMDB_ID, ROW_AIR_TIME, ROW_SEASON, ROW_EPISODE, ROW_STATUS, ROW_REFRESH_AT, ROW_INFOPROPERTIES, ROW_SEEDED_AT = range(8)
+
+
+def get_air_time(air_date):
+    from tmdbhelper.lib.addon.tmdate import convert_timestamp, convert_to_timestamp
+    time_obj = convert_timestamp(air_date, time_fmt="%Y-%m-%d", time_lim=10)
+    return convert_to_timestamp(time_obj) if time_obj else None
+
+
+def get_refresh_days(air_date, status):
+    from tmdbhelper.lib.addon.tmdate import date_in_range
+    if status in ['Canceled', 'Ended']:
+        return 30  # Check in a month just in case gets renewed on another network
+    if air_date and date_in_range(air_date, 10, -2, date_fmt="%Y-%m-%d", date_lim=10):
+        return 1  # Item airing this week so check again tomorrow in case schedule changes
+    return 7  # Item airing in more than a week (or no date yet) so let's check next week just in case of changes
+
+
+class AiringSchedule():
+    def __init__(self, prefix='next_aired', tmdb_api=None, cache=None):
+        """
+        Rows of (tmdb_id, air_time, season, episode, status, refresh_at, infoproperties, seeded_at) for each tvshow kept sorted by air time
+        Rows are only refetched once their refresh_at has passed and airing lists are a range query over the air times
+        Rows are dropped once no list has seeded their tvshow for AIRING_SCHEDULE_UNSEEN days
+        """
+        self.prefix = prefix
+        self.cache_name = f'schedule.{prefix}'
+        self._tmdb_api = tmdb_api
+        self._cache = cache or BasicCache(filename=AIRING_SCHEDULE)
+        self._updates = {}  # Rows fetched since load which are merged into stored table on save
+        self._seeded = {}  # Times rows were seeded by a list since load which are merged into stored table on save
+
+    @property
+    def tmdb_api(self):
+        if not self._tmdb_api:
+            from tmdbhelper.lib.api.tmdb.api import TMDb
+            self._tmdb_api = TMDb()
+        return self._tmdb_api
+
+    @property
+    def rows(self):
+        try:
+            return self._rows
+        except AttributeError:
+            self._rows = self.get_stored_rows()
+            return self._rows
+
+    def get_stored_rows(self):
+        """ Rows stored before seeded_at was added are treated as seeded when first read """
+        rows = self._cache.get_cache(self.cache_name) or []
+        return {i[ROW_TMDB_ID]: i if len(i) > ROW_SEEDED_AT else i + [set_timestamp(0)] for i in rows}
+
+    @staticmethod
+    def is_unseen(row):
+        return not get_timestamp(row[ROW_SEEDED_AT] + AIRING_SCHEDULE_UNSEEN * 86400)
+
+    @property
+    def index(self):
+        """ Rows with an air time sorted by air time and the matching list of air times for bisect """
+        try:
+            return self._index
+        except AttributeError:
+            rows = sorted((i for i in self.rows.values() if i[ROW_AIR_TIME]), key=lambda i: i[ROW_AIR_TIME])
+            self._index = (rows, [i[ROW_AIR_TIME] for i in rows])
+            return self._index
+
+    def get_due(self, tmdb_ids=None, limit=None):
+        """ Returns tmdb_ids without a row or whose row refresh_at has passed """
+        tmdb_ids = [k for k, v in self.rows.items() if not self.is_unseen(v)] if tmdb_ids is None else tmdb_ids
+        due = [i for i in tmdb_ids if i not in self.rows or not get_timestamp(self.rows[i][ROW_REFRESH_AT])]
+        return due[:limit] if limit else due
+
+    def get_row(self, tmdb_id):
+        ip = self.tmdb_api.get_tvshow_nextaired(tmdb_id)
+        if not ip:
+            return
+        air_date = ip.get(f'{self.prefix}.original')
+        status = ip.get('status')
+        return [
+            tmdb_id, get_air_time(air_date), ip.get(f'{self.prefix}.season'), ip.get(f'{self.prefix}.episode'),
+            status, set_timestamp(get_refresh_days(air_date, status) * 86400), ip, set_timestamp(0)]
+
+    def set_seeded(self, tmdb_ids):
+        """ Mark rows as seeded by a list -- only updated daily so loading a list doesn't rewrite the table """
+        for tmdb_id in tmdb_ids:
+            row = self.rows.get(tmdb_id)
+            if not row or get_timestamp(row[ROW_SEEDED_AT] + 86400):
+                continue
+            self._seeded[tmdb_id] = set_timestamp(0)
+            self.rows[tmdb_id] = row[:ROW_SEEDED_AT] + [self._seeded[tmdb_id]]
+
+    def update(self, tmdb_ids=None, limit=None):
+        """
+        Refetch due rows for tmdb_ids seeded by a list (or all seen rows if None) and store table
+        Returns count of rows refetched
+        """
+        from tmdbhelper.lib.addon.thread import ParallelThread
+        if tmdb_ids is not None:
+            self.set_seeded(tmdb_ids)
+        due = self.get_due(tmdb_ids, limit)
+        with ParallelThread(due, self.get_row) as pt:
+            item_queue = pt.queue
+        for tmdb_id, row in zip(due, item_queue):
+            if not row:
+                continue
+            if tmdb_id in self.rows and tmdb_ids is None:  # Service refresh keeps the time a list last seeded the row
+                row[ROW_SEEDED_AT] = self.rows[tmdb_id][ROW_SEEDED_AT]
+            self.rows[tmdb_id] = self._updates[tmdb_id] = row
+        self.save(prune=tmdb_ids is None)
+        return len(due)
+
+    def get_range(self, start=None, tmdb_ids=None, reverse=False):
+        """ Returns rows airing after start timestamp optionally limited to tmdb_ids """
+        rows, air_times = self.index
+        rows = rows[bisect_right(air_times, start):] if start else rows
+        rows = [i for i in rows if i[ROW_TMDB_ID] in tmdb_ids] if tmdb_ids is not None else rows
+        return rows[::-1] if reverse else rows
+
+    def get_item(self, row):
+        from tmdbhelper.lib.api.mapping import get_empty_item
+        prefix, tmdb_id, ip = self.prefix, row[ROW_TMDB_ID], row[ROW_INFOPROPERTIES]
+        item = get_empty_item()
+        item['infoproperties'] = ip.copy()
+        item['infolabels']['mediatype'] = 'episode'
+        item['infolabels']['title'] = ip.get(f'{prefix}.name')
+        item['infolabels']['episode'] = ip.get(f'{prefix}.episode')
+        item['infolabels']['season'] = ip.get(f'{prefix}.season')
+        item['infolabels']['plot'] = ip.get(f'{prefix}.plot')
+        item['infolabels']['year'] = ip.get(f'{prefix}.year')
+        item['infolabels']['premiered'] = ip.get(f'{prefix}.original')
+        item['art']['thumb'] = ip.get(f'{prefix}.thumb')
+        item['label'] = f"{item['infolabels']['title']} ({item['infolabels']['premiered']})"
+        item['infoproperties']['tmdb_type'] = 'episode'
+        item['infoproperties']['tmdb_id'] = item['unique_ids']['tvshow.tmdb'] = tmdb_id
+        item['params'] = {
+            'info': 'details',
+            'tmdb_type': 'tv',
+            'tmdb_id': tmdb_id,
+            'episode': item['infolabels']['episode'],
+            'season': item['infolabels']['season']}
+        return item
+
+    @use_thread_lock(AIRING_SCHEDULE_LOCK, timeout=30, polling=0.1)
+    def save(self, prune=False):
+        """ Merge our rows into the stored table so rows refetched by other lists or the service aren't lost """
+        if not self._updates and not self._seeded and not prune:
+            return
+        rows = self.get_stored_rows()
+        for tmdb_id, row in self._updates.items():
+            stored = rows.get(tmdb_id)
+            rows[tmdb_id] = row[:ROW_SEEDED_AT] + [max(row[ROW_SEEDED_AT], stored[ROW_SEEDED_AT] if stored else 0)]
+        for tmdb_id, seeded_at in self._seeded.items():
+            if tmdb_id in rows and rows[tmdb_id][ROW_SEEDED_AT] < seeded_at:
+                rows[tmdb_id] = rows[tmdb_id][:ROW_SEEDED_AT] + [seeded_at]
+        unseen = [k for k, v in rows.items() if self.is_unseen(v)] if prune else []
+        for tmdb_id in unseen:
+            del rows[tmdb_id]
+        if self._updates or self._seeded or unseen:
+            self._cache.set_cache(list(rows.values()), self.cache_name, cache_days=CACHE_EXTENDED)
+        self._rows, self._updates, self._seeded = rows, {}, {}
+        try:
+            del self._index
+        except AttributeError:
+            pass
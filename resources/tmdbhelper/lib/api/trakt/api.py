@@ -37,6 +37,8 @@ class TraktAPI(RequestAPI, TraktMethods):
         self.last_activities = {}
         self.sync_activities = {}
         self.sync = {}
+        self.serve_stale = True  # Set False to rebuild outdated next episodes table rather than serve it stale
+        self.served_stale = False  # Set True once an outdated next episodes table was served
         self.sync_item_limit = 20 * max(get_setting('pagemulti_sync', 'int'), page_length)
         self.item_limit = 20 * max(get_setting('pagemulti_trakt', 'int'), page_length)
         self.login() if force else self.authorize()
@@ -12,6 +12,22 @@ class TraktMethods():
             self._get_sorted_list = get_sorted_list
             return self._get_sorted_list(self, *args, **kwargs)
 
+    def get_sorted_items(self, *args, **kwargs):
+        try:
+            return self._get_sorted_items(self, *args, **kwargs)
+        except AttributeError:
+            from tmdbhelper.lib.api.trakt.methods.lists import get_sorted_items
+            self._get_sorted_items = get_sorted_items
+            return self._get_sorted_items(self, *args, **kwargs)
+
+    def get_paginated_items(self, *args, **kwargs):
+        try:
+            return self._get_paginated_items(self, *args, **kwargs)
+        except AttributeError:
+            from tmdbhelper.lib.api.trakt.methods.lists import get_paginated_items
+            self._get_paginated_items = get_paginated_items
+            return self._get_paginated_items(self, *args, **kwargs)
+
     def get_simple_list(self, *args, **kwargs):
         try:
             return self._get_simple_list(self, *args, **kwargs)
@@ -412,6 +428,14 @@ class TraktMethods():
             self._get_episodes_watchcount = get_episodes_watchcount
             return self._get_episodes_watchcount(self, *args, **kwargs)
 
+    def get_episodes_watchcount_table(self, *args, **kwargs):
+        try:
+            return self._get_episodes_watchcount_table(self, *args, **kwargs)
+        except AttributeError:
+            from tmdbhelper.lib.api.trakt.methods.progress import get_episodes_watchcount_table
+            self._get_episodes_watchcount_table = get_episodes_watchcount_table
+            return self._get_episodes_watchcount_table(self, *args, **kwargs)
+
     def get_hiddenitems(self, *args, **kwargs):
         try:
             return self._get_hiddenitems(self, *args, **kwargs)
@@ -436,6 +460,22 @@ class TraktMethods():
             self._get_upnext_episodes_list = get_upnext_episodes_list
             return self._get_upnext_episodes_list(self, *args, **kwargs)
 
+    def get_upnext_table(self, *args, **kwargs):
+        try:
+            return self._get_upnext_table(self, *args, **kwargs)
+        except AttributeError:
+            from tmdbhelper.lib.api.trakt.methods.progress import get_upnext_table
+            self._get_upnext_table = get_upnext_table
+            return self._get_upnext_table(self, *args, **kwargs)
+
+    def set_upnext_table(self, *args, **kwargs):
+        try:
+            return self._set_upnext_table(self, *args, **kwargs)
+        except AttributeError:
+            from tmdbhelper.lib.api.trakt.methods.progress import set_upnext_table
+            self._set_upnext_table = set_upnext_table
+            return self._set_upnext_table(self, *args, **kwargs)
+
     def get_upnext_episodes_listitems(self, *args, **kwargs):
         try:
             return self._get_upnext_episodes_listitems(self, *args, **kwargs)
@@ -484,6 +524,14 @@ class TraktMethods():
             self._get_episode_playprogress_list = get_episode_playprogress_list
             return self._get_episode_playprogress_list(self, *args, **kwargs)
 
+    def get_episode_playprogress_table(self, *args, **kwargs):
+        try:
+            return self._get_episode_playprogress_table(self, *args, **kwargs)
+        except AttributeError:
+            from tmdbhelper.lib.api.trakt.methods.progress import get_episode_playprogress_table
+            self._get_episode_playprogress_table = get_episode_playprogress_table
+            return self._get_episode_playprogress_table(self, *args, **kwargs)
+
     def get_episode_playprogress(self, *args, **kwargs):
         try:
             return self._get_episode_playprogress(self, *args, **kwargs)
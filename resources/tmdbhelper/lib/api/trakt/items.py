@@ -6,7 +6,7 @@ from tmdbhelper.lib.addon.tmdate import date_in_range
 from tmdbhelper.lib.items.filters import is_excluded
 
 
-REGEX_DEFARTICLE = r'(?i)^The '
+REGEX_DEFARTICLE = re.compile(r'(?i)^The ')
 
 EPISODE_PARAMS = {
     'info': 'details', 'tmdb_type': 'tv', 'tmdb_id': '{tmdb_id}',
@@ -17,72 +17,101 @@ SEASON_PARAMS = {
     'season': '{number}'}
 
 
-def _sort_itemlist(items, sort_by=None, sort_how=None, trakt_type=None):
+def _get_sort_key(sort_by=None, sort_how=None, trakt_type=None):
+    """ Returns tuple of (key_func, reverse) for sorting raw items by sort_by
+    Returns None for sort methods which aren't keyed (unsorted, random, airing)
+    Unknown sort methods fallback to sorting by listed_at descending
+    """
     _dummydict, _dummystr, _dummyint = {}, '', 0
     _dummystr_release = '9999-01-01T00:00:00.000Z'
 
     def _item_lambda_parent(i, sort_key):
         return i.get(trakt_type or i.get('type'), _dummydict).get(sort_key)
 
-    def _sort_lambda_simple(items, sort_key: str, sort_fallback=None, sort_reverse=False):
-        return sorted(items, key=lambda i: i.get(sort_key) or sort_fallback, reverse=sort_reverse)
+    def _sort_lambda_simple(sort_key: str, sort_fallback=None):
+        return lambda i: i.get(sort_key) or sort_fallback
 
-    def _sort_lambda_parent(items, sort_key: str, sort_fallback=None, sort_reverse=False):
-        return sorted(items, key=lambda i: _item_lambda_parent(i, sort_key) or sort_fallback, reverse=sort_reverse)
+    def _sort_lambda_parent(sort_key: str, sort_fallback=None):
+        return lambda i: _item_lambda_parent(i, sort_key) or sort_fallback
 
-    def _sort_lambda_ignore(items, sort_key: str, sort_fallback=None, sort_reverse=False):
+    def _sort_lambda_ignore(sort_key: str, sort_fallback=None):
         if not get_setting('trakt_sortignorearticle'):
-            return _sort_lambda_parent(items, sort_key, sort_fallback, sort_reverse)
-        return sorted(items, key=lambda i: re.sub(REGEX_DEFARTICLE, '', _item_lambda_parent(i, sort_key) or sort_fallback), reverse=sort_reverse)
+            return _sort_lambda_parent(sort_key, sort_fallback)
+        return lambda i: REGEX_DEFARTICLE.sub('', _item_lambda_parent(i, sort_key) or sort_fallback)
 
-    def _sort_lambda_max_of(items, sort_keys: list, sort_fallback=None, sort_reverse=False):
-        return sorted(items, key=lambda i: max(*[i.get(k) or sort_fallback for k in sort_keys]), reverse=sort_reverse)
+    def _sort_lambda_max_of(sort_keys: list, sort_fallback=None):
+        return lambda i: max(*[i.get(k) or sort_fallback for k in sort_keys])
 
-    def _sort_lambda_mixing(items, sort_keys: tuple, sort_fallback=None, sort_reverse=False, sort_types: list = None):
-        return sorted(
-            items,
-            key=lambda i: (
-                try_str(i.get(trakt_type or i.get('type'), _dummydict).get(sort_keys[0]) or sort_fallback))
+    def _sort_lambda_mixing(sort_keys: tuple, sort_fallback=None, sort_types: list = None):
+        return lambda i: (
+            try_str(i.get(trakt_type or i.get('type'), _dummydict).get(sort_keys[0]) or sort_fallback)
             if (trakt_type or i.get('type')) in sort_types
-            else (
-                try_str(i.get(trakt_type or i.get('type'), _dummydict).get(sort_keys[1]) or sort_fallback)),
-            reverse=sort_reverse)
+            else try_str(i.get(trakt_type or i.get('type'), _dummydict).get(sort_keys[1]) or sort_fallback))
+
+    reverse = True if sort_how == 'desc' else False
+    routing = {
+        'rank': lambda: _sort_lambda_simple('rank', _dummyint),
+        'plays': lambda: _sort_lambda_simple('plays', _dummyint),
+        'watched': lambda: _sort_lambda_simple('last_watched_at', _dummystr),
+        'paused': lambda: _sort_lambda_simple('paused_at', _dummystr),
+        'added': lambda: _sort_lambda_simple('listed_at', _dummystr),
+        'collected': lambda: _sort_lambda_max_of(['collected_at', 'last_collected_at'], _dummystr),
+        'title': lambda: _sort_lambda_ignore('title', _dummystr),
+        'year': lambda: _sort_lambda_parent('year', _dummyint if reverse else 9999),
+        'released': lambda: _sort_lambda_mixing(('first_aired', 'released',), _dummystr if reverse else _dummystr_release, sort_types=['show', 'episode']),
+        'runtime': lambda: _sort_lambda_parent('runtime', _dummyint),
+        'popularity': lambda: _sort_lambda_parent('comment_count', _dummyint),
+        'percentage': lambda: _sort_lambda_parent('rating', _dummyint),
+        'votes': lambda: _sort_lambda_parent('votes', _dummyint),
+        'activity': lambda: _sort_lambda_max_of(['last_watched_at', 'paused_at', 'listed_at'], _dummystr),
+    }
+
+    if sort_by in ['unsorted', 'random', 'airing']:
+        return
+    try:
+        return (routing[sort_by](), reverse)
+    except KeyError:
+        return (_sort_lambda_simple('listed_at', _dummystr), True)
+
+
+def _sort_itemlist(items, sort_by=None, sort_how=None, trakt_type=None):
+    _dummydict, _dummystr, _dummyint = {}, '', 0
 
     def _sort_lambda_airing(items, sort_start: int):
         ly, lx = partition_list(items, lambda i: date_in_range(
             i.get(trakt_type or i.get('type'), _dummydict).get('first_aired'),
             utc_convert=True, start_date=sort_start, days=abs(sort_start) + 1))
-        return _sort_lambda_parent(list(lx), 'first_aired', _dummystr, True) + list(ly)
+        return sorted(lx, key=lambda i: i.get(trakt_type or i.get('type'), _dummydict).get('first_aired') or _dummystr, reverse=True) + list(ly)
 
     def _sort_lambda_random(items):
         random.shuffle(items)
         return items
 
-    reverse = True if sort_how == 'desc' else False
-    routing = {
-        'unsorted': lambda: items,
-        'rank': lambda: _sort_lambda_simple(items, 'rank', _dummyint, reverse),
-        'plays': lambda: _sort_lambda_simple(items, 'plays', _dummyint, reverse),
-        'watched': lambda: _sort_lambda_simple(items, 'last_watched_at', _dummystr, reverse),
-        'paused': lambda: _sort_lambda_simple(items, 'paused_at', _dummystr, reverse),
-        'added': lambda: _sort_lambda_simple(items, 'listed_at', _dummystr, reverse),
-        'collected': lambda: _sort_lambda_max_of(items, ['collected_at', 'last_collected_at'], _dummystr, reverse),
-        'title': lambda: _sort_lambda_ignore(items, 'title', _dummystr, reverse),
-        'year': lambda: _sort_lambda_parent(items, 'year', _dummyint if reverse else 9999, reverse),
-        'released': lambda: _sort_lambda_mixing(items, ('first_aired', 'released',), _dummystr if reverse else _dummystr_release, reverse, sort_types=['show', 'episode']),
-        'runtime': lambda: _sort_lambda_parent(items, 'runtime', _dummyint, reverse),
-        'popularity': lambda: _sort_lambda_parent(items, 'comment_count', _dummyint, reverse),
-        'percentage': lambda: _sort_lambda_parent(items, 'rating', _dummyint, reverse),
-        'votes': lambda: _sort_lambda_parent(items, 'votes', _dummyint, reverse),
-        'random': lambda: _sort_lambda_random(items, ),
-        'activity': lambda: _sort_lambda_max_of(items, ['last_watched_at', 'paused_at', 'listed_at'], _dummystr, reverse),
-        'airing': lambda: _sort_lambda_airing(items, try_int(sort_how, fallback=_dummyint))
-    }
-
-    try:
-        return routing[sort_by]()
-    except KeyError:
-        return _sort_lambda_simple(items, 'listed_at', _dummystr, True)
+    if sort_by == 'unsorted':
+        return items
+    if sort_by == 'random':
+        return _sort_lambda_random(items)
+    if sort_by == 'airing':
+        return _sort_lambda_airing(items, try_int(sort_how, fallback=_dummyint))
+    key_func, reverse = _get_sort_key(sort_by, sort_how, trakt_type)
+    return sorted(items, key=key_func, reverse=reverse)
+
+
+def get_sort_index(items, sort_by=None, sort_how=None, trakt_type=None):
+    """ Returns list of indexes of items in sorted order or None if sort can't be indexed (airing is relative to today)
+    Sort keys are computed once per item and the items themselves are left in place
+    """
+    if sort_by == 'airing':
+        return
+    index = list(range(len(items)))
+    if sort_by == 'unsorted':
+        return index
+    if sort_by == 'random':
+        random.shuffle(index)
+        return index
+    key_func, reverse = _get_sort_key(sort_by, sort_how, trakt_type)
+    keys = [key_func(i) for i in items]
+    return sorted(index, key=keys.__getitem__, reverse=reverse)
 
 
 def _get_item_title(item):
@@ -132,6 +161,24 @@ def _get_item_unique_ids(item, unique_ids=None, prefix=None, show=None):
     return del_empty_keys(unique_ids)
 
 
+def _get_item_key(item, item_type=None):
+    """ Get key from raw item to check for duplicates without configuring the item
+    Returns None if item would be skipped by _get_item_info for missing a TMDb ID
+    """
+    item_info = item.get(item_type, {}) or item
+    if not item_info:
+        return
+    show_ids = (item.get('show') or {}).get('ids', {}) if item_type in ['season', 'episode'] else {}
+    tmdb_id = show_ids.get('tmdb') or item_info.get('ids', {}).get('tmdb')
+    if not tmdb_id:
+        return
+    if item_type == 'episode':
+        return (tmdb_id, _get_item_title(item_info), item_info.get('season'), item_info.get('number'))
+    if item_type == 'season':
+        return (tmdb_id, _get_item_title(item_info), item_info.get('number'), None)
+    return (tmdb_id, _get_item_title(item_info), None, None)
+
+
 def _get_item_info(item, item_type=None, base_item=None, check_tmdb_id=True, params_def=None):
     base_item = base_item or {}
     item_info = item.get(item_type, {}) or item
@@ -172,6 +219,7 @@ class TraktItems():
         self.sort_by = 'unsorted'
         self.sort_how = None
         self.configured = {'items': [], 'headers': {k.lower(): v for k, v in headers.items()} if headers else {}}
+        self._item_keys = {}
 
     def sort_items(self, sort_by=None, sort_how=None):
         """ (Re)Sorts items and returns sorted items """
@@ -180,29 +228,59 @@ class TraktItems():
         self.items = _sort_itemlist(self.items, self.sort_by, self.sort_how, self.trakt_type)
         return self.items
 
+    def filter_items(self, permitted_types=None, dedupe=True):
+        """ Filters raw items to permitted types with TMDb IDs and no duplicates without configuring them """
+        item_keys, items = {}, []
+        for i in self.items:
+            i_type = self.trakt_type or i.get('type', None)
+            if permitted_types and i_type not in permitted_types:
+                continue
+            item_key = _get_item_key(i, i_type)
+            if not item_key:
+                continue
+            if dedupe:
+                if item_key in item_keys.setdefault(i_type, set()):
+                    continue
+                item_keys[i_type].add(item_key)
+            items.append(i)
+        self.items = items
+        return self.items
+
     def configure_items(self, permitted_types=None, params_def=None, filters=None):
         """ (Re)Configures items for passing to listitem class in container and returns configured items """
         for i in self.items:
             i_type = self.trakt_type or i.get('type', None)
             if permitted_types and i_type not in permitted_types:
                 continue
+            # Check we haven't already added that item before doing the work of configuring it
+            item_key = _get_item_key(i, i_type)
+            if not item_key or item_key in self._item_keys.get(i_type, ()):
+                continue
             item = _get_item_info(i, item_type=i_type, params_def=params_def)
             if not item:
                 continue
             if filters and is_excluded(item, **filters):
                 continue
-            # Check we haven't already added that item
-            unique_id = f"{item['unique_ids']['tmdb']}_{item.get('label')}_{item['infolabels'].get('season')}_{item['infolabels'].get('episode')}"
-            if unique_id in self.configured.get(f'{i_type}_ids', []):
-                continue
-            # Add item ID to checklist to avoid duplicates
-            self.configured.setdefault(f'{i_type}_ids', []).append(unique_id)
+            # Add item key to checklist to avoid duplicates
+            self._item_keys.setdefault(i_type, set()).add(item_key)
             # Also add item to a list only containing that item type
             # Useful if we need to only get one type of item from a mixed list (e.g. only "movies")
             self.configured.setdefault(f'{i_type}s', []).append(item)
             self.configured['items'].append(item)
         return self.configured
 
+    def configure_page(self, page=None, limit=None, params_def=None):
+        """ Configures only the items on the requested page and returns configured items with page headers
+        Items should already be sorted and filtered so that pages are sliced from the final list order
+        """
+        from tmdbhelper.lib.items.pages import PaginatedItems
+        paginated = PaginatedItems(items=self.items, page=page, limit=limit)
+        self.items = paginated.items
+        self.configure_items(params_def=params_def)
+        self.configured['headers'] = paginated.headers
+        self.configured['next_page'] = paginated.next_page
+        return self.configured
+
     def build_items(self, sort_by=None, sort_how=None, permitted_types=None, params_def=None, filters=None):
         """ Sorts and Configures Items """
         self.sort_items(sort_by, sort_how)
@@ -11,6 +11,63 @@ from tmdbhelper.lib.monitor.cronjob import CRONJOB_POLL_TIME
 LASTACTIVITIES_DATA = 'TraktSyncLastActivities'
 LASTACTIVITIES_LOCK = 'TraktSyncLastActivities.Locked'
 LASTACTIVITIES_EXPIRY = 'TraktSyncLastActivities.Expires'
+LASTACTIVITIES_GENERATION = 'TraktSyncLastActivities.Generation'
+
+
+class LastActivities():
+    def __init__(self):
+        """
+        Snapshot of last_activities decoded once per process
+        Window property data is only decoded again when another process or thread sets a new expiry
+        Generation increases whenever a new response differs so other caches can cheaply check for changes
+        """
+        self.data = {}
+        self.expires = None
+        self.generation = 0
+
+    @property
+    def is_expired(self):
+        return bool(self.expires and self.expires < set_timestamp(0, True))
+
+    @staticmethod
+    def get_expires():
+        return get_property(LASTACTIVITIES_EXPIRY, is_type=int) or -1
+
+    def reload(self, expires):
+        self.data = data_loads(get_property(LASTACTIVITIES_DATA)) or {}
+        self.generation = get_property(LASTACTIVITIES_GENERATION, is_type=int) or 0
+        self.expires = expires
+        return self.data
+
+    def get(self):
+        expires = self.get_expires()
+        if expires != self.expires:
+            return self.reload(expires)
+        return self.data
+
+    def set(self, response):
+        generation = get_property(LASTACTIVITIES_GENERATION, is_type=int) or 0
+        if response != self.get():
+            generation = max(generation + 1, set_timestamp(0, True))  # Seed from time so generation survives restart
+        expires = set_timestamp(CRONJOB_POLL_TIME, True)
+        get_property(LASTACTIVITIES_DATA, set_property=data_dumps(response))  # Dump data to property
+        get_property(LASTACTIVITIES_GENERATION, set_property=generation)
+        get_property(LASTACTIVITIES_EXPIRY, set_property=expires)  # Set activity expiry
+        self.data, self.generation, self.expires = response, generation, expires
+        return self.data
+
+    def has_changed(self, generation):
+        """ Check if last_activities changed since generation without decoding unless a new expiry was set """
+        self.get()
+        return self.generation > (generation or 0)
+
+
+LASTACTIVITIES = LastActivities()
+
+
+def get_last_activity_generation():
+    LASTACTIVITIES.get()
+    return LASTACTIVITIES.generation
 
 
 def del_lastactivities_expiry():
@@ -20,23 +77,13 @@ def del_lastactivities_expiry():
 @is_authorized
 def get_last_activity(self, activity_type=None, activity_key=None, cache_refresh=False, cache_only=False, skip_online=False):
 
-    last_activities_expires = None
-
-    def _cache_expired():
-        """ Check if the cached last_activities has expired """
-        last_activities_expires = get_property(LASTACTIVITIES_EXPIRY, is_type=int) or -1
-        if last_activities_expires and last_activities_expires < set_timestamp(0, True):
-            return True
-        return False
-
     def _cache_activity():
         """ Get last_activities from Trakt and add to cache while locking other lookup threads """
         with WindowProperty((LASTACTIVITIES_LOCK, 1)):
             kodi_log('ReSync last_activities', 1)
             response = self.get_response_json('sync/last_activities')  # Retrieve data from Trakt
             if response:
-                get_property(LASTACTIVITIES_DATA, set_property=data_dumps(response))  # Dump data to property
-                get_property(LASTACTIVITIES_EXPIRY, set_property=set_timestamp(CRONJOB_POLL_TIME, True))  # Set activity expiry
+                LASTACTIVITIES.set(response)
         return response
 
     def _cache_router():
@@ -45,14 +92,16 @@ def get_last_activity(self, activity_type=None, activity_key=None, cache_refresh
         if cache_refresh:
             return _cache_activity()
 
-        if not _cache_expired():
-            return self.last_activities or data_loads(get_property(LASTACTIVITIES_DATA))
+        activities = LASTACTIVITIES.get()
+
+        if not LASTACTIVITIES.is_expired:
+            return activities
 
-        if skip_online and last_activities_expires == -1:
-            return self.last_activities or data_loads(get_property(LASTACTIVITIES_DATA))
+        if skip_online and LASTACTIVITIES.expires == -1:
+            return activities
 
         if has_property_lock(LASTACTIVITIES_LOCK):  # Other thread getting data so wait for it
-            return data_loads(get_property(LASTACTIVITIES_DATA))
+            return LASTACTIVITIES.get()
 
         return _cache_activity()
 
@@ -3,6 +3,9 @@ from tmdbhelper.lib.addon.consts import CACHE_SHORT
 from tmdbhelper.lib.api.trakt.decorators import is_authorized
 
 
+TRAKT_PAGE_SIZE = 1000  # Items per page when walking every page of a large Trakt list
+
+
 @use_simple_cache(cache_days=CACHE_SHORT)
 def get_simple_list(self, *args, trakt_type=None, **kwargs):
     response = self.get_response(*args, **kwargs)
@@ -12,33 +15,159 @@ def get_simple_list(self, *args, trakt_type=None, **kwargs):
     return TraktItems(response.json(), headers=response.headers, trakt_type=trakt_type).configure_items()
 
 
-@use_simple_cache(cache_days=CACHE_SHORT)
+def get_paginated_items(self, *args, page_size=TRAKT_PAGE_SIZE, cache_name=None, stamp=None, **kwargs):
+    """ Returns dict of all items and first page headers for a paginated Trakt path or None if any page failed
+    First page is requested alone for x-pagination-page-count then remaining pages are requested in parallel
+    Each page is decoded separately so no single huge response needs to be downloaded and decoded at once
+    Completed pages are stored under cache_name so a later call resumes after a page timed out
+    """
+    from jurialmunkey.parser import try_int
+    from tmdbhelper.lib.addon.thread import ParallelThread
+
+    def _get_page(page):
+        response = self.get_response(*args, page=page, limit=page_size, **kwargs)
+        if response is None:
+            return
+        try:
+            items = response.json()
+        except ValueError:
+            return
+        if not isinstance(items, list):
+            return
+        return {'items': items, 'headers': {k.lower(): v for k, v in response.headers.items()}}
+
+    partial_name = f'{cache_name}.pages' if cache_name else None
+    partial = (self._cache.get_cache(partial_name) if partial_name else None) or {}
+    partial = partial if partial.get('stamp') == stamp else {}
+    pages = partial.get('pages') or {}
+    headers = partial.get('headers')
+
+    if '1' not in pages:
+        response = _get_page(1)
+        if not response:
+            return
+        pages['1'], headers = response['items'], response['headers']
+
+    page_count = try_int(headers.get('x-pagination-page-count'), fallback=1)
+    remaining = [i for i in range(2, page_count + 1) if f'{i}' not in pages]
+    with ParallelThread(remaining, _get_page) as pt:
+        item_queue = pt.queue
+    for page, response in zip(remaining, item_queue):
+        if response:
+            pages[f'{page}'] = response['items']
+
+    if len(pages) < page_count:
+        if partial_name:
+            self._cache.set_cache(
+                {'stamp': stamp, 'headers': headers, 'pages': pages}, partial_name, cache_days=CACHE_SHORT)
+        return
+    if partial:
+        self._cache.set_cache({}, partial_name, cache_days=CACHE_SHORT)
+    return {'items': [j for i in range(1, page_count + 1) for j in pages[f'{i}']], 'headers': headers}
+
+
+def _get_sorted_items_stamp(self, path, extended=None):
+    """ Returns Trakt last activity timestamps which change when the user's list or merged sync data changes
+    Returns None if the list isn't tracked by last activities so stored list is kept until it expires
+    """
+    activities = []
+    if 'watchlist' in path:
+        activities.append(('watchlist', 'updated_at'))
+    elif path.startswith('users/me/'):
+        activities.append(('lists', 'updated_at'))
+    if extended in ['sync', 'inprogress']:
+        activities += [('movies', 'watched_at'), ('episodes', 'watched_at')]
+    if not activities:
+        return
+    stamp = [self.get_last_activity(activity_type, activity_key) for activity_type, activity_key in activities]
+    if -1 in stamp:  # Not authorized so can't check activities
+        return
+    return stamp
+
+
+def get_sorted_items(
+        self, path, sort_by=None, sort_how=None, extended=None, permitted_types=None, cache_refresh=False, cache_only=False,
+        genres=None, years=None, query=None, languages=None, countries=None, runtimes=None, studio_ids=None
+):
+    """ Returns raw list items sorted and filtered for permitted types and duplicates but not configured
+    Raw list is fetched once and stored alongside a separate index of item positions for each sort method
+    Changing sort method or page is an index lookup until the list expires or its Trakt activity changes
+    """
+    from tmdbhelper.lib.addon.plugin import format_name, get_setting
+    from uuid import uuid4
+    from tmdbhelper.lib.api.trakt.items import TraktItems, get_sort_index
+
+    cache_name = format_name(
+        'TraktAPI.get_sorted_items.', path, extended=extended, permitted_types=permitted_types,
+        genres=genres, years=years, query=query, languages=languages, countries=countries, runtimes=runtimes, studio_ids=studio_ids)
+
+    stamp = None if cache_only else _get_sorted_items_stamp(self, path, extended)
+    stored = None if cache_refresh else self._cache.get_cache(cache_name)
+    if stored and stamp and stored.get('stamp') != stamp:
+        stored = None
+
+    def _get_stored_list():
+        response = self.get_paginated_items(
+            path, extended=extended, cache_only=cache_only, cache_name=cache_name, stamp=stamp,
+            genres=genres, years=years, query=query, languages=languages, countries=countries, runtimes=runtimes, studio_ids=studio_ids
+        )
+
+        if not response:
+            return
+
+        if extended == 'sync':
+            items = self.merge_sync_sort(response['items'])
+        elif extended == 'inprogress':
+            items = self.filter_inprogress(self.merge_sync_sort(response['items']))
+        else:
+            items = response['items']
+
+        stored_list = {
+            'stamp': stamp,
+            'generation': uuid4().hex,  # Unique per store so a sort index is never matched to another version of the list
+            'sort_by': response['headers'].get('x-sort-by'),
+            'sort_how': response['headers'].get('x-sort-how'),
+            'items': TraktItems(items).filter_items(permitted_types, dedupe=False)}
+        self._cache.set_cache(stored_list, cache_name, cache_days=CACHE_SHORT)
+        return stored_list
+
+    stored = stored or _get_stored_list()
+
+    if not stored:
+        return
+
+    sort_by = sort_by or stored.get('sort_by')
+    sort_how = sort_how or stored.get('sort_how')
+    index_name = f'{cache_name}.{sort_by}.{sort_how}'
+    if sort_by == 'title':
+        index_name = f'{index_name}.{get_setting("trakt_sortignorearticle")}'
+
+    # Duplicates are removed after sorting so that the first item in sort order is kept
+    index = self._cache.get_cache(index_name)
+    if not index or index.get('generation') != stored['generation']:
+        index = {'generation': stored['generation'], 'index': get_sort_index(stored['items'], sort_by, sort_how)}
+        if index['index'] is None:  # Sort method can't be indexed so sort items directly
+            return TraktItems(TraktItems(stored['items']).sort_items(sort_by, sort_how)).filter_items()
+        self._cache.set_cache(index, index_name, cache_days=CACHE_SHORT)
+
+    return TraktItems([stored['items'][x] for x in index['index']]).filter_items()
+
+
 def get_sorted_list(
         self, path, sort_by=None, sort_how=None, extended=None, trakt_type=None, permitted_types=None, cache_refresh=False, cache_only=False,
-        genres=None, years=None, query=None, languages=None, countries=None, runtimes=None, studio_ids=None
+        genres=None, years=None, query=None, languages=None, countries=None, runtimes=None, studio_ids=None, page=None, limit=None
 ):
-    response = self.get_response(
-        path, extended=extended, limit=4095, cache_only=cache_only,
+    """ Returns a page of a sorted list -- only the items on the requested page are configured """
+    items = self.get_sorted_items(
+        path, sort_by, sort_how, extended, permitted_types=permitted_types, cache_refresh=cache_refresh, cache_only=cache_only,
         genres=genres, years=years, query=query, languages=languages, countries=countries, runtimes=runtimes, studio_ids=studio_ids
     )
 
-    if not response:
+    if items is None:
         return
 
-    def _get_sorted_list_items():
-        if extended == 'sync':
-            return self.merge_sync_sort(response.json())
-        if extended == 'inprogress':
-            return self.filter_inprogress(self.merge_sync_sort(response.json()))
-        return response.json()
-
-    items = _get_sorted_list_items()
-
     from tmdbhelper.lib.api.trakt.items import TraktItems
-    return TraktItems(items, headers=response.headers).build_items(
-        sort_by=sort_by or response.headers.get('x-sort-by'),
-        sort_how=sort_how or response.headers.get('x-sort-how'),
-        permitted_types=permitted_types)
+    return TraktItems(items, trakt_type=trakt_type).configure_page(page=page, limit=limit or self.item_limit)
 
 
 @is_authorized
@@ -88,12 +217,11 @@ def get_basic_list(
         )
 
     elif sort_by is not None:  # Sorted list manually paginated because need to sort first
-        from tmdbhelper.lib.items.pages import PaginatedItems
         response = self.get_sorted_list(
             path, sort_by, sort_how, extended, cache_refresh=cache_refresh, cache_only=cache_only,
-            genres=genres, years=years, query=query, languages=languages, countries=countries, runtimes=runtimes, studio_ids=studio_ids
+            genres=genres, years=years, query=query, languages=languages, countries=countries, runtimes=runtimes, studio_ids=studio_ids,
+            page=page, limit=limit
         )
-        response = PaginatedItems(items=response['items'], page=page, limit=limit).get_dict()
 
     else:  # Unsorted lists can be paginated by the API
         response = self.get_simple_list(
@@ -163,19 +291,16 @@ def get_custom_list(
     sorted_items = self.get_sorted_list(
         path, sort_by, sort_how, extended,
         permitted_types=['movie', 'show', 'person', 'episode'],
-        cache_refresh=cache_refresh, cache_only=cache_only
+        cache_refresh=cache_refresh, cache_only=cache_only,
+        page=page, limit=limit
     ) or {}
 
-    from tmdbhelper.lib.items.pages import PaginatedItems
-    paginated_items = PaginatedItems(
-        items=sorted_items.get('items', []), page=page, limit=limit)
-
     return {
-        'items': paginated_items.items,
+        'items': sorted_items.get('items', []),
         'movies': sorted_items.get('movies', []),
         'shows': sorted_items.get('shows', []),
         'persons': sorted_items.get('persons', []),
-        'next_page': paginated_items.next_page}
+        'next_page': sorted_items.get('next_page', [])}
 
 
 def get_list_of_genres(self, trakt_type):
@@ -312,8 +437,13 @@ def get_sync_list(
     from tmdbhelper.lib.api.trakt.items import TraktItems
     limit = limit or self.sync_item_limit
     sync = self.get_sync(sync_type, trakt_type, extended=extended)
-    func = TraktItems(items=sync, trakt_type=trakt_type).build_items
-    response = func(sort_by, sort_how, filters=filters)
+    trakt_items = TraktItems(items=sync, trakt_type=trakt_type)
+    if not filters:  # Without filters we know the final list order before configuring so only configure the page
+        trakt_items.sort_items(sort_by, sort_how)
+        trakt_items.filter_items()
+        response = trakt_items.configure_page(page=page, limit=limit)
+        return response['items'] if not next_page else response['items'] + response['next_page']
+    response = trakt_items.build_items(sort_by, sort_how, filters=filters)
     if not response:
         return
     from tmdbhelper.lib.items.pages import PaginatedItems
@@ -1,8 +1,14 @@
 from tmdbhelper.lib.api.trakt.decorators import use_activity_cache, is_authorized
-from tmdbhelper.lib.addon.consts import CACHE_SHORT, CACHE_LONG
+from tmdbhelper.lib.addon.consts import CACHE_SHORT, CACHE_LONG, UPNEXT_TABLE_MAXSTALE
 from tmdbhelper.lib.addon.thread import use_thread_lock
 
 
+UPNEXT_TABLE_CACHE = 'TraktAPI.get_upnext_table'
+UPNEXT_TABLE_LOCK = 'TraktAPI.set_upnext_table.Locked'
+UPNEXT_TABLE_QUEUE = 'TraktAPI.set_upnext_table.Queued'
+PLAYPROGRESS_KEYS = ('id', 'progress', 'paused_at')
+
+
 def get_ondeck_list(self, page=1, limit=None, sort_by=None, sort_how=None, trakt_type=None):
     from tmdbhelper.lib.api.trakt.items import TraktItems
     from tmdbhelper.lib.items.pages import PaginatedItems
@@ -47,7 +53,6 @@ def get_inprogress_shows_list(self, page=1, limit=None, params=None, next_page=T
 def get_inprogress_shows(self):
     from tmdbhelper.lib.addon.tmdate import date_in_range
     from tmdbhelper.lib.api.trakt.items import TraktItems
-    from tmdbhelper.lib.addon.thread import ParallelThread
     from tmdbhelper.lib.addon.plugin import get_setting
 
     def _get_calendar_episodes(startdate=-14, days=15, id_type='slug'):
@@ -68,32 +73,28 @@ def get_inprogress_shows(self):
         return calendar
     response = self.get_sync('watched', 'show', extended='full')
     response = TraktItems(response).sort_items('watched', 'desc')
-    hidden_shows = self.get_hiddenitems('show')
+    hidden_shows = self.get_hiddenitems('show') or set()
     calendar_episodes = _get_calendar_episodes() if get_setting('nextepisodes_usecalendar') else None
-    with ParallelThread(response, self.is_inprogress_show, hidden_shows, calendar_episodes) as pt:
-        item_queue = pt.queue
-    return [i for i in item_queue if i]
+    watchcounts = self.get_episodes_watchcount_table() or {}
+    return [i for i in response if self.is_inprogress_show(i, hidden_shows, calendar_episodes, watchcounts)]
 
 
-def is_inprogress_show(self, item, hidden_shows=None, calendar_episodes=None):
+def is_inprogress_show(self, item, hidden_shows=None, calendar_episodes=None, watchcounts=None):
     """
     Checks whether the show passed is in progress by comparing total and watched
-    Optionally can pass a list of hidden_shows trakt slugs to ignore
+    Optionally can pass a set of hidden_shows trakt slugs to ignore
+    Optionally can pass watchcounts table from get_episodes_watchcount_table to avoid looking up each show
     """
-    from jurialmunkey.parser import find_dict_list_index
 
     def _calendar_is_watched():
         if not calendar_episodes or slug not in calendar_episodes:
             return True
-        for season in calendar_episodes[slug]:
-            x = find_dict_list_index(item['seasons'], 'number', season)
-            if x is None:
+        seasons = {i.get('number'): {j.get('number') for j in i.get('episodes', [])} for i in item.get('seasons', [])}
+        for season, episodes in calendar_episodes[slug].items():
+            if season not in seasons:
                 return False  # New Season Airing
-            episodes = item['seasons'][x]['episodes']
-            for episode in calendar_episodes[slug][season]:
-                x = find_dict_list_index(episodes, 'number', episode)
-                if x is None:
-                    return False  # New Episode Airing
+            if not seasons[season].issuperset(episodes):
+                return False  # New Episode Airing
         return True
 
     try:
@@ -112,11 +113,14 @@ def is_inprogress_show(self, item, hidden_shows=None, calendar_episodes=None):
     if not aired_episodes:
         return
 
-    from tmdbhelper.lib.api.trakt.decorators import use_lastupdated_cache
-    watch_episodes = use_lastupdated_cache(
-        self._cache, self.get_episodes_watchcount, slug, 'slug', tvshow=item, count_progress=True,
-        cache_name=f'TraktAPI.get_episodes_watchcount.response.slug.{slug}.True',
-        sync_info=item) or 0
+    if watchcounts is not None:
+        watch_episodes = watchcounts.get(slug) or 0
+    else:
+        from tmdbhelper.lib.api.trakt.decorators import use_lastupdated_cache
+        watch_episodes = use_lastupdated_cache(
+            self._cache, self.get_episodes_watchcount, slug, 'slug', tvshow=item, count_progress=True,
+            cache_name=f'TraktAPI.get_episodes_watchcount.response.slug.{slug}.True',
+            sync_info=item) or 0
 
     if aired_episodes <= watch_episodes and _calendar_is_watched():
         return
@@ -135,13 +139,33 @@ def get_episodes_watchcount(
     Use count_progress to check progress against reset_at value rather than just count watched
     """
     from jurialmunkey.parser import try_int
-    from tmdbhelper.lib.addon.tmdate import convert_timestamp
 
     season = try_int(season) if season is not None else None
     if not tvshow and id_type and unique_id:
         tvshow = self.get_sync('watched', 'show', id_type, extended='full').get(unique_id)
     if not tvshow:
         return
+    return _get_episodes_watchcount(tvshow, season, exclude_specials, count_progress)
+
+
+@use_activity_cache('episodes', 'watched_at', cache_days=CACHE_LONG)
+def get_episodes_watchcount_table(self, exclude_specials=True):
+    """
+    Get table of watched episode counts checked against reset_at for every watched show keyed by slug
+    Computed in one pass over the watched sync list rather than looking up each show separately
+    """
+    table = {}
+    for i in self.get_sync('watched', 'show', extended='full') or []:
+        try:
+            slug = i['show']['ids']['slug']
+        except (KeyError, TypeError):
+            continue
+        table[slug] = _get_episodes_watchcount(i, exclude_specials=exclude_specials, count_progress=True)
+    return table
+
+
+def _get_episodes_watchcount(tvshow, season=None, exclude_specials=True, count_progress=False):
+    from tmdbhelper.lib.addon.tmdate import convert_timestamp
     reset_at = None
     if count_progress and tvshow.get('reset_at'):
         reset_at = convert_timestamp(tvshow['reset_at'])
@@ -163,25 +187,47 @@ def get_episodes_watchcount(
     return count
 
 
-@use_activity_cache(cache_days=CACHE_LONG)
 def get_hiddenitems(self, trakt_type, progress_watched=True, progress_collected=True, calendar=True, id_type='slug'):
-    """ Get items that are hidden on Trakt """
+    """
+    Get set of items that are hidden on Trakt for O(1) membership checks
+    Stored as a sorted list which is only refreshed when the hidden_at activity for the type changes
+    Hidden sections are requested in parallel when a refresh is needed
+    """
+    from tmdbhelper.lib.addon.plugin import format_name
+    from tmdbhelper.lib.addon.thread import ParallelThread
+
     def _get_comp_item(i):
         try:
             return i[trakt_type]['ids'][id_type]
-        except (KeyError, AttributeError):
+        except (KeyError, AttributeError, TypeError):
             return
+
+    def _get_section(section):
+        response = self.get_paginated_items('users', 'hidden', section, type=trakt_type)
+        return response['items'] if response else None
+
     if not trakt_type or not id_type:
-        return []
-    response = []
-    if progress_watched:
-        response += self.get_response_json('users', 'hidden', 'progress_watched', type=trakt_type, limit=4095)
-    if progress_collected:
-        response += self.get_response_json('users', 'hidden', 'progress_collected', type=trakt_type, limit=4095)
-    if calendar:
-        response += self.get_response_json('users', 'hidden', 'calendar', type=trakt_type, limit=4095)
-    hidden_items = {j for j in (_get_comp_item(i) for i in response) if j}
-    return list(hidden_items)
+        return set()
+
+    sections = [k for k, v in (
+        ('progress_watched', progress_watched),
+        ('progress_collected', progress_collected),
+        ('calendar', calendar)) if v]
+    cache_name = format_name('TraktAPI.get_hiddenitems.', trakt_type, id_type, *sections)
+    stamp = self.get_last_activity(f'{trakt_type}s', 'hidden_at')
+    stored = self._cache.get_cache(cache_name)
+    if stored and (stamp == -1 or stored.get('stamp') == stamp):
+        return set(stored.get('items') or [])
+    if stamp == -1:  # Not authorized so only use stored items
+        return set()
+
+    with ParallelThread(sections, _get_section) as pt:
+        item_queue = pt.queue
+    hidden_items = {j for j in (_get_comp_item(i) for response in item_queue if response for i in response) if j}
+    if None in item_queue:  # Request failed so don't store incomplete set until activity changes
+        return hidden_items
+    self._cache.set_cache({'stamp': stamp, 'items': sorted(hidden_items)}, cache_name, cache_days=CACHE_LONG)
+    return hidden_items
 
 
 def get_upnext_list(self, unique_id, id_type=None, page=1, limit=None):
@@ -213,25 +259,108 @@ def get_upnext_episodes_list(self, page=1, sort_by=None, sort_how='desc', limit=
     return response.items + response.next_page
 
 
-def get_upnext_episodes_listitems(self, sort_by=None, sort_how='desc'):
-    from tmdbhelper.lib.api.trakt.items import TraktItems
+def _get_upnext_table_stamp(self):
+    """ Activities which change which shows are in-progress or what their next episode is """
+    return [self.get_last_activity('episodes', 'watched_at'), self.get_last_activity('shows', 'hidden_at')]
+
+
+def _is_upnext_table_current(table, stamp):
+    from tmdbhelper.lib.addon.tmdate import get_timestamp
+    return table.get('stamp') == stamp and get_timestamp(table.get('expires'))
+
+
+def _is_upnext_table_servable(table):
+    from jurialmunkey.parser import try_int
+    from tmdbhelper.lib.addon.tmdate import get_timestamp
+    return bool(table.get('shows')) and get_timestamp(try_int(table.get('expires')) + UPNEXT_TABLE_MAXSTALE)
+
+
+def get_upnext_table(self, cache_refresh=False, serve_stale=None):
+    """
+    Get materialised table of the next episode to watch for each in-progress show
+    Table is stored with last activities and only rebuilt when they change or table expires
+    Set serve_stale=False (or TraktAPI.serve_stale) to always rebuild an outdated table in this thread (e.g. from the service)
+    Sets TraktAPI.served_stale if an outdated table was returned so that items built from it aren't stored
+    Returns dict with 'order' list of show slugs and 'shows' dict of {slug: {'last_updated_at', 'item'}}
+    """
+    from tmdbhelper.lib.addon.plugin import get_setting
+
+    table = self._cache.get_cache(UPNEXT_TABLE_CACHE) or {}
+    stamp = _get_upnext_table_stamp(self)
+
+    if -1 in stamp:  # Not authorized so only return stored table
+        return table
+    if not cache_refresh and _is_upnext_table_current(table, stamp):
+        return table
+
+    # Serve last stored table instantly and queue rebuild for service if user allows stale next episodes
+    # Plugin interpreter is torn down after endOfDirectory so the rebuild can't be run in a thread here
+    # Table is only served stale for a limited time after expiry in case service isn't running to rebuild it
+    serve_stale = self.serve_stale if serve_stale is None else serve_stale
+    if serve_stale and not cache_refresh and _is_upnext_table_servable(table) and get_setting('nextepisodes_servestale'):
+        from jurialmunkey.window import get_property
+        get_property(UPNEXT_TABLE_QUEUE, set_property='True')
+        self.served_stale = True
+        return table
+
+    return self.set_upnext_table(stamp, cache_refresh=cache_refresh)
+
+
+@use_thread_lock(UPNEXT_TABLE_LOCK, timeout=30, polling=0.1)
+def set_upnext_table(self, stamp, cache_refresh=False):
+    """
+    Rebuild materialised table of next episodes
+    Next episode is only looked up for shows whose Trakt last_updated_at changed since table was stored
+    """
+    from tmdbhelper.lib.addon.tmdate import set_timestamp
     from tmdbhelper.lib.addon.thread import ParallelThread
 
-    shows = self.get_inprogress_shows() or []
+    # Another thread might have rebuilt the table while we waited for the lock
+    table = self._cache.get_cache(UPNEXT_TABLE_CACHE) or {}
+    if not cache_refresh and _is_upnext_table_current(table, stamp):
+        return table
 
-    def _get_upnext_episodes(i, get_single_episode=True):
-        """ Helper func for upnext episodes to pass through threaded """
+    stored = table.get('shows') or {}
+    shows = {}
+    for i in self.get_inprogress_shows() or []:
         try:
-            show = i['show']
-            slug = show['ids']['slug']
+            slug = i['show']['ids']['slug']
         except (AttributeError, KeyError):
-            return
-        return self.get_upnext_episodes(slug, show, get_single_episode=get_single_episode)
+            continue
+        row = stored.get(slug)
+        if not cache_refresh and row and 'item' in row and row.get('last_updated_at') == i.get('last_updated_at'):
+            shows[slug] = row
+            continue
+        shows[slug] = {'last_updated_at': i.get('last_updated_at'), 'show': i['show']}
 
-    # Get upnext episodes threaded
-    with ParallelThread(shows, _get_upnext_episodes) as pt:
+    def _get_upnext_episode(slug):
+        """ Helper func for upnext episodes to pass through threaded """
+        row = shows[slug]
+        if 'show' not in row:
+            return row
+        return {'last_updated_at': row['last_updated_at'], 'item': self.get_upnext_episodes(slug, row['show'], get_single_episode=True)}
+
+    # Get changed upnext episodes threaded
+    order = list(shows)
+    with ParallelThread(order, _get_upnext_episode) as pt:
         item_queue = pt.queue
-    items = [i for i in item_queue if i]
+
+    table = {
+        'stamp': stamp,
+        'expires': set_timestamp(CACHE_SHORT * 24 * 3600),
+        'order': order,
+        'shows': {slug: row for slug, row in zip(order, item_queue) if row}}
+    self._cache.set_cache(table, UPNEXT_TABLE_CACHE, cache_days=CACHE_LONG)
+    return table
+
+
+def get_upnext_episodes_listitems(self, sort_by=None, sort_how='desc'):
+    from tmdbhelper.lib.api.trakt.items import TraktItems
+    from tmdbhelper.lib.addon.thread import ParallelThread
+
+    table = self.get_upnext_table()
+    shows = table.get('shows') or {}
+    items = [shows[slug]['item'] for slug in table.get('order') or [] if shows.get(slug, {}).get('item')]
 
     if not sort_by:
         return items
@@ -306,47 +435,36 @@ def get_movie_playprogress(self, unique_id, id_type, key='progress'):
         return
 
 
-@use_thread_lock("TraktAPI.get_episode_playprogress_list.Locked", timeout=10, polling=0.05)
-@use_activity_cache('episodes', 'paused_at', cache_days=CACHE_LONG)
-def get_episode_playprogress_list(self, id_type):
-    from tmdbhelper.lib.files.futils import pickle_deepcopy
-
-    sync_list = self.get_sync('playback', 'show')
-    if not sync_list:
-        return {}
-
-    main_list = {}
-
-    def _get_tv_show():
-        try:
-            return main_list[show_id]
-        except KeyError:
-            pass
+def get_episode_playprogress_table(self, id_type, key='progress'):
+    """
+    Get flat table of episode play progress keyed by (unique_id, season, episode)
+    Built once for a container so that per item lookups don't need cache I/O
+    """
+    table = {}
+    for i in self.get_sync('playback', 'show') or []:
         try:
-            return pickle_deepcopy(i['show'])
-        except KeyError:
-            return {}
+            table[(i['show']['ids'][id_type], i['episode']['season'], i['episode']['number'])] = i[key]
+        except (KeyError, TypeError):
+            continue
+    return table
 
-    def _get_episode():
-        try:
-            return pickle_deepcopy(i['episode'])
-        except KeyError:
-            return {}
 
-    for i in sync_list:
+@use_thread_lock("TraktAPI.get_episode_playprogress_list.Locked", timeout=10, polling=0.05)
+@use_activity_cache('episodes', 'paused_at', cache_days=CACHE_LONG)
+def get_episode_playprogress_list(self, id_type):
+    """
+    Get compact index of paused episodes built in one pass over the playback sync list
+    Keyed by "{unique_id}.{season}.{episode}" with values in order of PLAYPROGRESS_KEYS
+    """
+    index = {}
+    for i in self.get_sync('playback', 'show') or []:
         try:
             show_id = i['show']['ids'][id_type]
-        except KeyError:
+        except (KeyError, TypeError):
             continue
-
-        tv_show = _get_tv_show()
-        seasons = tv_show.setdefault('seasons', {})
-        episode = _get_episode()
-        season = seasons.setdefault(episode.get('season', 0), {})
-        season[episode.get('number', 0)] = i
-        main_list[show_id] = tv_show
-
-    return main_list
+        episode = i.get('episode') or {}
+        index[f'{show_id}.{episode.get("season", 0)}.{episode.get("number", 0)}'] = [i.get(k) for k in PLAYPROGRESS_KEYS]
+    return index
 
 
 @use_activity_cache('episodes', 'paused_at', cache_days=CACHE_LONG)
@@ -355,11 +473,9 @@ def get_episode_playprogress(self, unique_id, id_type, season, episode, key='pro
     season = try_int(season, fallback=-2)  # Make fallback -2 to prevent matching on 0
     episode = try_int(episode, fallback=-2)  # Make fallback -2 to prevent matching on 0
     playprogress = self.get_episode_playprogress_list(id_type)
-    if not playprogress or unique_id not in playprogress:
-        return
     try:
-        return playprogress[unique_id]['seasons'][season][episode][key]
-    except (KeyError, AttributeError):
+        return playprogress[f'{unique_id}.{season}.{episode}'][PLAYPROGRESS_KEYS.index(key)]
+    except (KeyError, TypeError, ValueError):
         return
 
 
@@ -384,6 +500,25 @@ def get_episode_playcount(self, unique_id, id_type, season, episode):
                 return j.get('plays', 1)
 
 
+def get_show_playcount_table(tvshow, exclude_specials=True):
+    """
+    Get flat lookup table for a show from its watched sync item so per episode lookups are dict gets
+    plays: (season, episode) -> plays
+    watched: season -> watched episodes -- season None for whole show
+    aired: aired episodes for whole show
+    """
+    plays, watched, total = {}, {}, 0
+    for i in tvshow.get('seasons') or []:
+        season, episodes = i.get('number', -1), i.get('episodes') or []
+        count = 0 if exclude_specials and season == 0 else len(episodes)
+        watched[season] = watched.get(season, 0) + count
+        total += count
+        for j in episodes:
+            plays.setdefault((season, j.get('number', -1)), j.get('plays', 1))
+    watched[None] = total
+    return {'plays': plays, 'watched': watched, 'aired': (tvshow.get('show') or {}).get('aired_episodes')}
+
+
 def get_episodes_airedcount(self, unique_id, id_type, season=None):
     """ Gets the number of aired episodes for a tvshow """
     try:
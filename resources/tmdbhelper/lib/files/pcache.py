@@ -0,0 +1,106 @@
+from tmdbhelper.lib.files.bcache import BasicCache
+from tmdbhelper.lib.addon.consts import CACHE_SHORT
+
+
+PLAY_BUNDLE = 'PlayBundle.db'
+PLAY_BUNDLE_IDS = ['tmdb', 'tvdb', 'imdb', 'slug', 'trakt']
+PLAY_BUNDLE_INFOLABELS = ['title', 'tvshowtitle', 'originaltitle', 'year', 'premiered']
+PLAY_BUNDLE_SEED_INFOLABELS = ['mediatype', 'title', 'season', 'episode']
+
+
+class PlayBundle():
+    def __init__(self, tmdb_type, tmdb_id, season=None, episode=None, cache=None):
+        """
+        Compact bundle of ids, titles, translations and next episode queue for a playable item
+        Seeded after a container is handed to Kodi so that players can read it in one cache hit
+        """
+        self.tmdb_type = 'movie' if tmdb_type == 'movie' else 'tv'
+        self.tmdb_id = tmdb_id
+        self.season = season if self.tmdb_type == 'tv' else None
+        self.episode = episode if self.tmdb_type == 'tv' else None
+        self.cache_name = f'playbundle.{self.tmdb_type}.{self.tmdb_id}.{self.season}.{self.episode}'
+        self._cache = cache or BasicCache(filename=PLAY_BUNDLE)
+
+    @property
+    def data(self):
+        try:
+            return self._data
+        except AttributeError:
+            self._data = (self._cache.get_cache(self.cache_name) or {}) if self.tmdb_id else {}
+            return self._data
+
+    @property
+    def has_external_ids(self):
+        """ Bundle has the Trakt ids so external id lookup isn't needed -- episodes also need their own trakt id """
+        prefix = 'tvshow.' if self.episode is not None else ''
+        unique_ids = self.data.get('unique_ids') or {}
+        if self.episode is not None and not unique_ids.get('trakt'):
+            return False
+        return bool(unique_ids.get(f'{prefix}trakt') and unique_ids.get(f'{prefix}slug'))
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def get_external_ids(self):
+        if not self.has_external_ids:
+            return
+        return {'unique_ids': self.data['unique_ids']}
+
+    def get_language(self, language):
+        return (self.data.get('languages') or {}).get(language)
+
+    def set(self, **kwargs):
+        """ Update keys in bundle and write back to cache only if something changed """
+        if not self.tmdb_id or all(self.data.get(k) == v for k, v in kwargs.items()):
+            return self.data
+        self.data.update(kwargs)
+        self._cache.set_cache(self.data, self.cache_name, cache_days=CACHE_SHORT)
+        return self.data
+
+    def set_unique_ids(self, unique_ids):
+        if not unique_ids:
+            return self.data
+        unique_ids = {k: v for k, v in unique_ids.items() if v and k.split('.')[-1] in PLAY_BUNDLE_IDS}
+        return self.set(unique_ids={**(self.data.get('unique_ids') or {}), **unique_ids})
+
+    def set_language(self, language, item):
+        if not language or not item:
+            return self.data
+        return self.set(languages={**(self.data.get('languages') or {}), language: item})
+
+    def set_next_episodes(self, episodes):
+        """ Store minimal seeds for next episodes which ItemBuilder can rebuild from its own cache """
+        seeds = [{
+            'label': i.get('label'),
+            'infolabels': {k: v for k, v in i.get('infolabels', {}).items() if k in PLAY_BUNDLE_SEED_INFOLABELS},
+            'unique_ids': i.get('unique_ids') or {},
+            'params': i.get('params') or {}} for i in episodes]
+        return self.set(next_episodes=seeds)
+
+    def set_from_listitem(self, li):
+        unique_ids = {k: v for k, v in li.unique_ids.items() if v and k.split('.')[-1] in PLAY_BUNDLE_IDS}
+        infolabels = {k: v for k, v in li.infolabels.items() if v and k in PLAY_BUNDLE_INFOLABELS}
+        return self.set(
+            unique_ids={**(self.data.get('unique_ids') or {}), **unique_ids},
+            infolabels=infolabels)
+
+
+def get_play_bundle(listitem, cache=None):
+    """ Get PlayBundle for a playable listitem or None if item isn't playable """
+    if listitem.params.get('info') != 'play':
+        return
+    if not listitem.params.get('tmdb_type') or not listitem.params.get('tmdb_id'):
+        return
+    return PlayBundle(
+        listitem.params['tmdb_type'], listitem.params['tmdb_id'],
+        listitem.params.get('season'), listitem.params.get('episode'), cache=cache)
+
+
+def set_play_bundles(listitems):
+    """ Seed ids and titles of all playable listitems in one pass using a single cache connection """
+    cache = BasicCache(filename=PLAY_BUNDLE)
+    for li in listitems:
+        play_bundle = get_play_bundle(li, cache=cache) if li else None
+        if not play_bundle:
+            continue
+        play_bundle.set_from_listitem(li)
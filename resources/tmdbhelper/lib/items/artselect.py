@@ -87,7 +87,7 @@ class _ArtworkSelector():
         manual = item['artwork'].setdefault('manual', {})
         manual[artwork_type] = success
         item['expires'] = self._timestamp()  # Reup our timestamp to force child items to recache
-        self._cache.set_cache(item, cache_name=self.get_cache_name(tmdb_type, tmdb_id, season), cache_days=10000)
+        self.set_cache_item(item, self.get_cache_name(tmdb_type, tmdb_id, season))
         return self.select_artwork(tmdb_type, tmdb_id, container_refresh, blacklist, season=season)
 
     def refresh_all_artwork(self, tmdb_type, tmdb_id, ok_dialog=True, container_refresh=True, season=None):
@@ -34,7 +34,89 @@ IMAGEPATH_MAP = {
     "season.poster": ARTWORK_QUALITY_POSTER
 }
 CACHE_DAYS = 10000
+CACHE_VERSION = 3
 BACKFILL_BLACKLIST = ['poster']
+REGEX_ITERPROP = re.compile(r'^(.*)\.([1-9][0-9]*)\.(.*)$')
+
+
+def split_iterprops(infoproperties):
+    """ Split infoproperties into basic dict and columnar dict of indexed properties
+    Indexed properties such as cast.1.name are stored as {'cast': {'name': ['Name']}} so that
+    each prefix and suffix key is only stored once per item instead of once per index
+    """
+    basic, columns = {}, {}
+    for k, v in infoproperties.items():
+        match = REGEX_ITERPROP.match(k)
+        if not match:
+            basic[k] = v
+            continue
+        prefix, x, suffix = match.groups()
+        x = int(x)
+        column = columns.setdefault(prefix, {}).setdefault(suffix, [])
+        if len(column) < x:
+            column.extend([None] * (x - len(column)))
+        column[x - 1] = v
+    return basic, columns
+
+
+def join_iterprops(infoproperties, columns):
+    """ Expand columnar dict of indexed properties back into infoproperties """
+    for prefix, suffixes in columns.items():
+        for suffix, column in suffixes.items():
+            for x, v in enumerate(column, start=1):
+                if v is None:
+                    continue
+                infoproperties[f'{prefix}.{x}.{suffix}'] = v
+    return infoproperties
+
+
+def encode_item(item):
+    """ Encode item into compact core dict and separate columnar iterprops dict
+    Items mapped by ItemBuilder already hold indexed properties in a separate iterprops dict
+    Items with iterprops joined into infoproperties (e.g. from get_item) are split by key pattern instead
+    """
+    listitem = item['listitem'].copy()
+    if 'iterprops' in listitem:
+        _, columns = split_iterprops(listitem.pop('iterprops') or {})
+    else:
+        listitem['infoproperties'], columns = split_iterprops(listitem.get('infoproperties') or {})
+    artwork = {k: v for k, v in item['artwork'].items() if k in ('tmdb', 'fanarttv', 'manual')}
+    quality_art = item['artwork'].get(ARTWORK_QUALITY)
+    if quality_art:  # Only store quality artwork separately if it differs from tmdb artwork
+        artwork['quality'] = [ARTWORK_QUALITY, None if quality_art == artwork.get('tmdb') else quality_art]
+    core = {'version': CACHE_VERSION, 'expires': item['expires'], 'listitem': listitem, 'artwork': artwork}
+    core['detailed'] = item.get('detailed', True)
+    return core, {'version': CACHE_VERSION, 'expires': item['expires'], 'columns': columns}
+
+
+def decode_item(core, iterprops=None):
+    """ Decode compact core dict and optional iterprops dict back into item """
+    if not core or core.get('version') != CACHE_VERSION:
+        return
+    artwork = core['artwork'].copy()
+    quality, quality_art = artwork.pop('quality', None) or (None, None)
+    if quality == ARTWORK_QUALITY:
+        artwork[ARTWORK_QUALITY] = quality_art or artwork.get('tmdb') or {}
+    item = {'listitem': core['listitem'].copy(), 'expires': core['expires'], 'artwork': artwork}
+    item['detailed'] = core.get('detailed', True)  # Items mapped only from list tier details lack detail tier iterprops
+    if iterprops is None:
+        item['basic_only'] = True  # Flag so that we don't overwrite cached iterprops when setting item back to cache
+        return item
+    if iterprops.get('version') != CACHE_VERSION or iterprops.get('expires') != core['expires']:
+        item['basic_only'] = True  # Iterprops missing or from another write so don't overwrite them with empty columns
+        return item
+    item['listitem']['iterprops'] = {}
+    join_iterprops(item['listitem']['iterprops'], iterprops.get('columns') or {})
+    return item
+
+
+def merge_iterprops(item):
+    """ Get copy of item with separate iterprops dict joined back into infoproperties """
+    if not item or 'listitem' not in item:
+        return item
+    listitem = item['listitem'].copy()
+    listitem['infoproperties'] = {**(listitem.pop('iterprops', None) or {}), **(listitem.get('infoproperties') or {})}
+    return {**item, 'listitem': listitem}
 
 
 class ItemBuilder(_ArtworkSelector):
@@ -64,10 +146,10 @@ class ItemBuilder(_ArtworkSelector):
         with TimerList(self.timer_lists, f'{tmdb_type}.{tmdb_id}.{season}', log_threshold=0.05, logging=self.log_timers):
             if tmdb_type != 'tv' or not tmdb_id:
                 return
-            self.parent_tv = self.get_item(tmdb_type=tmdb_type, tmdb_id=tmdb_id)
+            self.parent_tv = self._get_item(tmdb_type=tmdb_type, tmdb_id=tmdb_id)
             if season is None:
                 return
-            self.parent_season = self.get_item(tmdb_type=tmdb_type, tmdb_id=tmdb_id, season=season)
+            self.parent_season = self._get_item(tmdb_type=tmdb_type, tmdb_id=tmdb_id, season=season)
 
     def map_artwork(self, artwork):
         """ Remaps artwork from TMDb to expected quality """
@@ -144,9 +226,10 @@ class ItemBuilder(_ArtworkSelector):
 
     def get_tmdb_item(
             self, tmdb_type, tmdb_id, season=None, episode=None, base_item=None, manual_art=None,
-            base_is_season=False, cache_refresh=False):
+            base_is_season=False, cache_refresh=False, detailed=True):
         with TimerList(self.timer_lists, 'item_tmdb', log_threshold=0.05, logging=self.log_timers) as tl:
-            details = self.tmdb_api.get_details_request(tmdb_type, tmdb_id, season, episode, cache_refresh=cache_refresh)
+            details = self.tmdb_api.get_details_request(
+                tmdb_type, tmdb_id, season, episode, cache_refresh=cache_refresh, detailed=detailed)
             if not details:
                 if self.log_timers and tl.total_time > tl.log_threshold:  # TMDb API missing item so log fail time
                     kodi_log(f'item_tmdb -- get_details_request({tmdb_type},{tmdb_id},{season},{episode}) FAILED after {tl.total_time:.3f} sec', 1)
@@ -157,8 +240,10 @@ class ItemBuilder(_ArtworkSelector):
                 'listitem': self.tmdb_api.mapper.get_info(
                     details, tmdb_type,
                     base_item=base_item['listitem'] if base_item else None,
-                    base_is_season=base_is_season),
+                    base_is_season=base_is_season,
+                    split_iterprops=True),
                 'expires': self._timestamp(),
+                'detailed': detailed,
                 'artwork': {}}
             item['artwork']['tmdb'] = item['artwork'][ARTWORK_QUALITY] = item['listitem'].pop('art')
             if manual_art:
@@ -168,15 +253,37 @@ class ItemBuilder(_ArtworkSelector):
 
     def get_cache_name(self, tmdb_type, tmdb_id, season=None, episode=None):
         language = self.tmdb_api.language
-        return f'v2.{language}.{tmdb_type}.{tmdb_id}.{season}.{episode}'
+        return f'v{CACHE_VERSION}.{language}.{tmdb_type}.{tmdb_id}.{season}.{episode}'
+
+    def get_cache_item(self, name, iterprops=True):
+        """ Get item from compact cache -- iterprops are only read from cache if requested """
+        core = self._cache.get_cache(name)
+        if not core:
+            return
+        return decode_item(core, (self._cache.get_cache(f'{name}.iterprops') or {}) if iterprops else None)
+
+    def set_cache_item(self, item, name):
+        """ Set item to compact cache -- iterprops are only written if item was loaded with them """
+        if not item:
+            return item
+        core, iterprops = encode_item(item)
+        self._cache.set_cache(core, name, cache_days=CACHE_DAYS)
+        if not item.get('basic_only'):
+            self._cache.set_cache(iterprops, f'{name}.iterprops', cache_days=CACHE_DAYS)
+        return item
 
     def get_item(self, tmdb_type, tmdb_id, season=None, episode=None, cache_refresh=False):
+        """ Get item with indexed properties joined into infoproperties """
+        return merge_iterprops(self._get_item(tmdb_type, tmdb_id, season, episode, cache_refresh=cache_refresh))
+
+    def _get_item(self, tmdb_type, tmdb_id, season=None, episode=None, cache_refresh=False, iterprops=True):
+        """ Get item with indexed properties kept in separate listitem['iterprops'] dict """
         if not tmdb_type or not tmdb_id:
             return
 
         # Get cached item
         name = self.get_cache_name(tmdb_type, tmdb_id, season, episode)
-        item = None if cache_refresh else self._cache.get_cache(name)
+        item = None if cache_refresh else self.get_cache_item(name, iterprops=iterprops)
         if self.cache_only:
             return item
 
@@ -188,10 +295,10 @@ class ItemBuilder(_ArtworkSelector):
                 base_name_season = season
             parent = self.parent_tv if base_name_season is None else self.parent_season
             base_name = self.get_cache_name(tmdb_type, tmdb_id, base_name_season)
-            base_item = parent or self._cache.get_cache(base_name)
+            base_item = parent or self.get_cache_item(base_name, iterprops=False)
 
         # Check that our current item hasn't expired and needs refreshing
-        if item and get_timestamp(item['expires']):  # Our item hasn't expired
+        if item and get_timestamp(item['expires']) and (not iterprops or (item['detailed'] and not item.get('basic_only'))):  # Our item hasn't expired and has the details we need
             # Check that our parent item doesn't have newer details that we need to merge
             if not base_item or self._timeint(base_item['expires']) <= self._timeint(item['expires']):  # No new details in parent item
                 # Check that we aren't missing any artwork or need to remap artwork quality
@@ -201,7 +308,7 @@ class ItemBuilder(_ArtworkSelector):
                 # Else we've got current item details but we need to grab some artwork or remap quality
                 prefix = 'tvshow.' if season is not None and episode is None else ''  # Seasons should map tvshow art with prefix
                 item = self.get_artwork(item, tmdb_type, season, episode, base_item, prefix=prefix)  # Get art and map it
-                return self._cache.set_cache(item, name, cache_days=CACHE_DAYS)  # Re-add our item to the cache with new details
+                return self.set_cache_item(item, name)  # Re-add our item to the cache with new details
 
         # Item isn't current so it needs a refresh but let's make sure we keep manually set artwork
         prefix = ''
@@ -212,7 +319,9 @@ class ItemBuilder(_ArtworkSelector):
             base_artwork = base_item['artwork'].get('manual', {}) if base_item else {}  # Get parent manual art if available
             base_artwork = {k: v for k, v in base_artwork.items() if v}  # Filter out empties
             if cache_refresh or not base_item:  # No parent item or refreshing so let's try to get a new one
-                base_item = self.get_item(tmdb_type, tmdb_id, base_name_season, cache_refresh=cache_refresh)
+                base_item = self._get_item(tmdb_type, tmdb_id, base_name_season, cache_refresh=cache_refresh, iterprops=iterprops)
+            elif iterprops and base_item.get('basic_only'):  # Parent needs iterprops to map onto our item
+                base_item = self.get_cache_item(base_name) or base_item
             manual_art = self.join_base_artwork(base_artwork, manual_art, prefix=prefix)  # Join our manual artwork with our base
 
         # Try to get FTV artwork (if IDs are available) in parallel thread at same time as item
@@ -224,11 +333,12 @@ class ItemBuilder(_ArtworkSelector):
                 tmdb_type, tmdb_id, season=season, episode=episode,
                 base_item=base_item, manual_art=manual_art,
                 base_is_season=base_name_season is not None,
-                cache_refresh=cache_refresh)
+                cache_refresh=cache_refresh,
+                detailed=iterprops)
             item_queue = pt.queue
         ftv_art = item_queue[0] if item_queue else None
         item = self.get_artwork(item, tmdb_type, season, episode, base_item, prefix=prefix, ftv_art=ftv_art)
-        return self._cache.set_cache(item, name, cache_days=CACHE_DAYS)
+        return self.set_cache_item(item, name)
 
     def get_item_artwork(self, artwork, art_dict=None, is_season=False):
         def set_artwork(details=None, blacklist=[]):
@@ -254,16 +364,6 @@ class ItemBuilder(_ArtworkSelector):
         set_artwork(artwork.get('manual'))
         return art_dict
 
-    def _undo_iterprops(self, item, tmdb_type, tmdb_id, season, episode):
-        if 'infoproperties_basic' not in item:
-            item['infoproperties_basic'] = {
-                k: v for k, v in item['listitem']['infoproperties'].items()
-                if not re.match(r'.*\.[0-9]*\..*', k)}  # Filter out indexed properties to leave only basic props
-            name = self.get_cache_name(tmdb_type, tmdb_id, season, episode)
-            self._cache.set_cache(item, name, cache_days=CACHE_DAYS)  # Set back to cache
-        item['listitem']['infoproperties'] = item['infoproperties_basic']  # Set filtered ip to ip
-        return item
-
     def get_listitem(self, i, use_iterprops=True):
         li = ListItem(parent_params=self.parent_params, **i)
         mediatype = li.infolabels.get('mediatype')
@@ -271,11 +371,11 @@ class ItemBuilder(_ArtworkSelector):
         tmdb_id = li.unique_ids.get('tvshow.tmdb') if mediatype in ['season', 'episode'] else li.unique_ids.get('tmdb')
         season = li.infolabels.get('season', 0) if mediatype in ['season', 'episode'] else None
         episode = li.infolabels.get('episode') if mediatype == 'episode' else None
-        item = self.get_item(tmdb_type, tmdb_id, season, episode)
+        item = self._get_item(tmdb_type, tmdb_id, season, episode, iterprops=use_iterprops)
         if not item or 'listitem' not in item:
             return li
-        if not use_iterprops:
-            item = self._undo_iterprops(item, tmdb_type, tmdb_id, season, episode)
+        if use_iterprops:
+            item = merge_iterprops(item)
         li.set_details(item['listitem'], override=self.override)
         li.art = self.get_item_artwork(item['artwork'], is_season=mediatype in ['season', 'episode'])
         return li
@@ -42,8 +42,12 @@ class Container(CommonContainerAPIs):
 
         # KodiDB
         self.kodi_db = None
+        self.kodi_db_type = None
         self.thumb_override = 0
 
+        # Stale widgets
+        self.stale_refresh = False  # True when service is refreshing a stale widget so always get new items
+
     @property
     def is_fanarttv(self):
         try:
@@ -60,6 +64,44 @@ class Container(CommonContainerAPIs):
             self._is_widget = boolean(self.params.get('widget', False))
             return self._is_widget
 
+    @property
+    def stale_widget(self):
+        try:
+            return self._stale_widget
+        except AttributeError:
+            self._stale_widget = None
+            if self.is_widget and get_setting('widgets_servestale'):
+                from tmdbhelper.lib.items.stale import StaleWidget
+                self._stale_widget = StaleWidget(self.parent_params, self.trakt_api)
+            return self._stale_widget
+
+    @property
+    def is_served_stale(self):
+        """ Items built from an outdated next episodes table shouldn't be stored as rendered or stale widgets """
+        try:
+            return self._trakt_api.served_stale
+        except AttributeError:
+            return False
+
+    @property
+    def rendered_directory(self):
+        try:
+            return self._rendered_directory
+        except AttributeError:
+            self._rendered_directory = None
+            if not self.is_widget or not get_setting('widgets_rendercache') or self.stale_refresh:
+                return self._rendered_directory
+            if (self.params.get('info') or '').startswith('random_'):
+                return self._rendered_directory
+            from tmdbhelper.lib.items.rendered import RenderedDirectory, get_library_version
+            if not get_library_version():
+                return self._rendered_directory  # Service not running so library changes wouldn't invalidate
+            generation = None
+            if self.stale_widget and (self.stale_widget.is_fresh or self.stale_widget.is_stale):
+                generation = self.stale_widget.data['fresh_until']  # Stored widget refreshed so render again
+            self._rendered_directory = RenderedDirectory(self.params, self.trakt_api, generation)
+            return self._rendered_directory
+
     @property
     def is_cacheonly(self):
         try:
@@ -86,6 +128,26 @@ class Container(CommonContainerAPIs):
                 self._context_additions = [(get_localized(32496), 'RunScript(plugin.video.themoviedb.helper,make_node)')]
             return self._context_additions
 
+    @property
+    def context_menu_items(self):
+        try:
+            return self._context_menu_items
+        except AttributeError:
+            from tmdbhelper.lib.items.context import get_context_menu_items
+            self._context_menu_items = get_context_menu_items()
+            return self._context_menu_items
+
+    @property
+    def item_properties(self):
+        """ Properties shared by every item in container -- built once after property_params and plugin_category are set """
+        try:
+            return self._item_properties
+        except AttributeError:
+            self._item_properties = dict(self.property_params or {})
+            if self.plugin_category:
+                self._item_properties['widget'] = self.plugin_category
+            return self._item_properties
+
     @property
     def hide_watched(self):
         try:
@@ -194,6 +256,7 @@ class Container(CommonContainerAPIs):
             if not get_setting('local_db'):
                 return
             from tmdbhelper.lib.items.kodi import KodiDb
+            self.kodi_db_type = tmdb_type
             return KodiDb(tmdb_type)
 
     def _build_item(self, i):
@@ -233,12 +296,12 @@ class Container(CommonContainerAPIs):
             if self.hide_watched and try_int(li.infolabels.get('playcount')) != 0:
                 return
 
-            li.set_context_menu(additions=self.context_additions)  # Set the context menu items
+            li.set_context_menu(self.context_additions, self.context_menu_items)  # Set the context menu items
             li.set_uids_to_info()  # Add unique ids to properties so accessible in skins
             li.set_thumb_to_art(self.thumb_override == 2) if self.thumb_override else None  # Special override for calendars to prevent thumb spoilers
             li.set_params_reroute(self.is_fanarttv, self.params.get('extended'), self.is_cacheonly)  # Reroute details to proper end point
-            li.set_params_to_info(self.plugin_category)  # Set path params to properties for use in skins
-            li.infoproperties.update(self.property_params or {})
+            li.set_params_to_info()  # Set path params to properties for use in skins
+            li.infoproperties.update(self.item_properties)  # Container params and widget category shared by all items
             if self.thumb_override:
                 li.infolabels.pop('dbid', None)  # Need to pop the DBID if overriding thumb to prevent Kodi overwriting
             if li.next_page:
@@ -246,6 +309,12 @@ class Container(CommonContainerAPIs):
             self.trakt_method.set_playprogress(li)
             return li
 
+    @staticmethod
+    def set_play_bundles(items):
+        """ Seed ids and titles for players to avoid repeating lookups when played """
+        from tmdbhelper.lib.files.pcache import set_play_bundles
+        set_play_bundles(items)
+
     def precache_parent(self, tmdb_id, season=None):
         self.ib.get_parents(tmdb_type='tv', tmdb_id=tmdb_id, season=season)
         # PREBUILD_PARENTSHOW = ['seasons', 'episodes', 'episode_groups', 'trakt_upnext', 'episode_group_seasons']
@@ -339,13 +408,58 @@ class Container(CommonContainerAPIs):
         """
         return
 
+    def get_rendered_directory(self):
+        """ Replay stored listitems if rendered directory stamps match. Returns True if replayed """
+        if not self.rendered_directory:
+            return False
+        data = self.rendered_directory.get_items()
+        if not data:
+            return False
+        if self.stale_widget:
+            self.stale_widget.get_items()  # Count the load and queue a refresh if stored widget is stale
+        for k, v in data['container'].items():
+            setattr(self, k, v)
+        self.set_params_to_container()
+        from xbmcplugin import addDirectoryItems
+        addDirectoryItems(self.handle, self.rendered_directory.get_directory_items(data['items']))
+        return True
+
+    def set_rendered_directory(self, items):
+        if not self.rendered_directory:
+            return
+        if self.container_update or self.container_refresh or self.update_listing or self.is_served_stale:
+            return
+        self.rendered_directory.set_items(items, self)
+
+    def get_stale_items(self):
+        """ Get items from stored widget if fresh or within max staleness otherwise get new items and store them """
+        if not self.stale_widget:
+            return self.get_items(**self.params)
+
+        data = self.stale_widget.get_items() if not self.stale_refresh else None
+        if data:
+            for k, v in data['container'].items():
+                setattr(self, k, v)
+            self.kodi_db = self.get_kodi_database(self.kodi_db_type) if self.kodi_db_type else None
+            return data['items']
+
+        items = self.get_items(**self.params)
+        if not self.stale_refresh:
+            self.stale_widget.set_load('miss', len(items or []))
+        if self.container_update or self.container_refresh or self.update_listing or self.is_served_stale:
+            return items
+        self.stale_widget.set_items(items, self)
+        return items
+
     def get_directory(self, items_only=False, build_items=True):
         from threading import Thread
+        if not items_only and build_items and self.get_rendered_directory():
+            return self.finish_container()
         with TimerList(self.timer_lists, 'total', logging=self.log_timers):
             self._pre_sync = Thread(target=self.trakt_method.pre_sync, kwargs=self.params)
             self._pre_sync.start()
             with TimerList(self.timer_lists, 'get_list', logging=self.log_timers):
-                items = self.get_items(**self.params)
+                items = self.get_stale_items()
             if not items:
                 return
             if not build_items:
@@ -357,7 +471,9 @@ class Container(CommonContainerAPIs):
                 if items_only:
                     return items
                 self.add_items(items)
+                self.set_rendered_directory(items)
             self.finish_container()
+            self.set_play_bundles(items)  # Written after endOfDirectory so Kodi isn't waiting on the cache writes
         if self.log_timers:
             from tmdbhelper.lib.addon.logger import log_timer_report
             log_timer_report(self.timer_lists, self.paramstring)
@@ -49,6 +49,11 @@ CONTEXT_MENU_ITEMS = {
 }
 
 
+def get_context_menu_items():
+    """ Context menu definitions enabled in settings -- get once per container rather than per item """
+    return {name: mediatypes for name, mediatypes in CONTEXT_MENU_ITEMS.items() if get_setting(mediatypes['setting'])}
+
+
 class ContextMenu():
     """ Builds a context menu for a listitem based upon a definition of formattable keys
     If context params have format key in self.info but it is empty then item isn't built
@@ -68,7 +73,7 @@ class ContextMenu():
         self.mediatype = self._li.infolabels.get('mediatype')
 
     def get(self, context=None):
-        context = context or CONTEXT_MENU_ITEMS
+        context = get_context_menu_items() if context is None else context
         return [(name, str(item)) for name, item in (
             (name, self._build_item(mediatypes)) for name, mediatypes in context.items()) if item]
 
@@ -78,9 +83,6 @@ class ContextMenu():
         if not params_def or not router_def:
             return
 
-        if not get_setting(mediatypes['setting']):
-            return
-
         item = {}
         for k, v in params_def.items():
             try:  # Need to try accept in case hard-coded int/bool etc.
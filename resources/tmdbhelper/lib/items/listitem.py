@@ -122,9 +122,9 @@ class _ListItem(object):
     def unaired_bool(self):
         return False
 
-    def set_context_menu(self, additions=None):
+    def set_context_menu(self, additions=None, context=None):
         from tmdbhelper.lib.items.context import ContextMenu
-        self.context_menu += ContextMenu(self).get()
+        self.context_menu += ContextMenu(self).get(context)
         if not additions:
             return
         self.context_menu += additions
@@ -219,7 +219,6 @@ class _ListItem(object):
         self.infolabels['path'] = self.get_url()
 
         listitem = KodiListItem(label=self.label, label2=self.label2, path=self.infolabels['path'], offscreen=offscreen)
-        listitem.setLabel2(self.label2)
         listitem.setArt(self.set_art_fallbacks())
 
         if self.library != 'pictures':
@@ -231,7 +230,8 @@ class _ListItem(object):
             info_tag.set_resume_point(self.infoproperties)
 
         listitem.setProperties(self.infoproperties)
-        listitem.addContextMenuItems(self.context_menu)
+        if self.context_menu:
+            listitem.addContextMenuItems(self.context_menu)
 
         return listitem
 
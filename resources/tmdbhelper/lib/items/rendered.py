@@ -0,0 +1,92 @@
+from jurialmunkey.parser import boolean
+from jurialmunkey.window import get_property
+from tmdbhelper.lib.addon.plugin import ADDONDATA, get_condvisibility
+from tmdbhelper.lib.addon.consts import CACHE_SHORT
+from tmdbhelper.lib.addon.tmdate import set_timestamp, get_datetime_today
+from tmdbhelper.lib.files.bcache import BasicCache
+
+
+RENDERED_DIRECTORY = 'RenderedDirectory.db'
+RENDERED_LIBRARY_VERSION = 'KodiLibrary.Version'
+RENDERED_IGNORE_PARAMS = ['reload']
+RENDERED_CONTAINER = ['plugin_category', 'container_content', 'library', 'sort_methods']
+RENDERED_LISTITEM = [
+    'label', 'label2', 'path', 'library', 'is_folder', 'params', 'infolabels', 'infoproperties', 'art', 'cast',
+    'context_menu', 'stream_details', 'unique_ids']
+
+
+def get_library_version():
+    return get_property(RENDERED_LIBRARY_VERSION)
+
+
+def set_library_version():
+    """ Set by service whenever the Kodi video library changes so that rendered directories are invalidated """
+    return get_property(RENDERED_LIBRARY_VERSION, set_property=f'{set_timestamp(0)}')
+
+
+def get_activity_stamp(trakt_api):
+    """ Stamp of Trakt activity and Kodi library version which changes whenever watched state could have changed """
+    trakt_stamp = trakt_api.get_last_activity() if trakt_api and boolean(get_property('TraktIsAuth')) else None
+    return f'{trakt_stamp}|{get_library_version()}'
+
+
+def get_settings_hash():
+    from hashlib import md5
+    from tmdbhelper.lib.files.futils import read_file
+    return md5(read_file(f'{ADDONDATA}settings.xml').encode('utf-8')).hexdigest()
+
+
+class RenderedDirectory():
+    def __init__(self, params, trakt_api, generation=None, cache=None):
+        """
+        Final listitems added to a widget directory so a repeated request can replay addDirectoryItems
+        Stored output is only used while the settings, Trakt activity, Kodi library and widget stamps match
+        Today's date is part of the stamp so date relative labels and filters aren't replayed after midnight
+        """
+        self.params = {k: v for k, v in params.items() if v is not None and k not in RENDERED_IGNORE_PARAMS}
+        self.cache_name = 'rendered.' + '&'.join(f'{k}={v}' for k, v in sorted(self.params.items()))
+        self.trakt_api = trakt_api
+        self.generation = generation
+        self._cache = cache or BasicCache(filename=RENDERED_DIRECTORY)
+
+    @property
+    def stamp(self):
+        try:
+            return self._stamp
+        except AttributeError:
+            self._stamp = '|'.join(f'{i}' for i in (
+                get_datetime_today().strftime('%Y-%m-%d'),
+                get_settings_hash(),
+                get_activity_stamp(self.trakt_api),
+                get_property('IsSkinShortcut'),
+                get_condvisibility("Window.IsVisible(script-skinshortcuts.xml)"),
+                self.generation))
+            return self._stamp
+
+    def get_items(self):
+        """ Returns stored listitems and container attributes if stamps match otherwise None """
+        data = self._cache.get_cache(self.cache_name)
+        if not data or data.get('stamp') != self.stamp:
+            return
+        return data
+
+    def get_directory_items(self, items):
+        from tmdbhelper.lib.items.listitem import ListItem
+
+        def _get_directory_item(i):
+            li = ListItem(**i)
+            li.context_menu = [tuple(j) for j in li.context_menu]
+            return (li.get_url(), li.get_listitem(), li.is_folder)
+
+        return [_get_directory_item(i) for i in items]
+
+    def set_items(self, items, container):
+        items = [{k: getattr(li, k) for k in RENDERED_LISTITEM} for li in items if li]
+        if not items:
+            return
+        data = {
+            'stamp': self.stamp,
+            'items': items,
+            'container': {k: getattr(container, k, None) for k in RENDERED_CONTAINER}}
+        self._cache.set_cache(data, self.cache_name, cache_days=CACHE_SHORT)
+        return data
@@ -0,0 +1,173 @@
+from tmdbhelper.lib.addon.plugin import get_setting
+from tmdbhelper.lib.addon.consts import CACHE_MEDIUM, WIDGET_STALE_FRESH, WIDGET_STALE_LIMITS
+from tmdbhelper.lib.addon.tmdate import set_timestamp, get_timestamp
+from tmdbhelper.lib.files.bcache import BasicCache
+
+
+WIDGET_STALE = 'WidgetStale.db'
+WIDGET_STALE_NOTIFICATION = 'TMDbHelper.Widgets.Stale'
+WIDGET_STALE_SENDER = 'plugin.video.themoviedb.helper'
+WIDGET_STALE_CONTAINER = [
+    'container_content', 'plugin_category', 'library', 'thumb_override', 'sort_by_dbid', 'sort_methods',
+    'tmdb_cache_only', 'kodi_db_type']
+
+
+def get_cache_name(params):
+    return 'widget.' + '&'.join(f'{k}={v}' for k, v in sorted(params.items()))
+
+
+def notify_stale_load(params, state, count=0):
+    """ Send widget load to service with one NotifyAll so concurrent plugin loads can't overwrite each other """
+    from tmdbhelper.lib.api.kodi.rpc import get_jsonrpc
+    get_jsonrpc('JSONRPC.NotifyAll', {
+        'sender': WIDGET_STALE_SENDER,
+        'message': WIDGET_STALE_NOTIFICATION,
+        'data': {'params': params, 'state': state, 'count': count}})
+
+
+class StaleWidgetQueue():
+    def __init__(self):
+        """
+        Refresh queue, access counts and stale/fresh/miss counters of widget loads
+        Owned by service and only updated from plugin notifications so updates from parallel loads are never lost
+        """
+        from threading import Lock
+        self._lock = Lock()
+        self.queue = []
+        self.access = {}
+        self.counters = {'stale': 0, 'fresh': 0, 'miss': 0}
+
+    def on_notification(self, sender, method, data):
+        if sender != WIDGET_STALE_SENDER or method != f'Other.{WIDGET_STALE_NOTIFICATION}':
+            return
+        from tmdbhelper.lib.files.futils import json_loads
+        data = json_loads(data) if isinstance(data, str) else data
+        if not data or not data.get('params'):
+            return
+        self.set_load(data['params'], data.get('state'), data.get('count') or 0)
+
+    def set_load(self, params, state, count=0):
+        """ Record widget load so that service can pre-warm the most requested paths """
+        with self._lock:
+            self.counters[state] = self.counters.get(state, 0) + count
+            item = self.access.setdefault(get_cache_name(params), {'params': params, 'count': 0, 'hits': 0})
+            item['count'] += 1
+            item['hits'] += int(state != 'miss')
+            item['last'] = set_timestamp(0)
+            if state == 'stale' and params not in self.queue:
+                self.queue.append(params)
+
+    def pop(self):
+        with self._lock:
+            return self.queue.pop(0) if self.queue else None
+
+    def get_access(self, active=None):
+        """ Returns copy of access counts dropping paths not loaded within active seconds """
+        with self._lock:
+            if active:
+                now = set_timestamp(0)
+                self.access = {k: v for k, v in self.access.items() if now - v.get('last', 0) < active}
+            return dict(self.access)
+
+    def get_hit_rate(self):
+        """ Returns fraction of widget loads which were served from a stored widget since service started """
+        access = self.get_access()
+        loads = sum(i['count'] for i in access.values())
+        if not loads:
+            return 'hits 0/0'
+        hits = sum(i['hits'] for i in access.values())
+        return f'hits {hits}/{loads} ({hits / loads:.0%})'
+
+    def get_report(self):
+        """ Returns fraction of widget items served stale/fresh/missed since service started """
+        counts = dict(self.counters)
+        total = sum(counts.values())
+        if not total:
+            return 'stale 0/0'
+        return f'stale {counts["stale"]}/{total} ({counts["stale"] / total:.0%}) fresh {counts["fresh"]} miss {counts["miss"]}'
+
+
+STALE_WIDGET_QUEUE = StaleWidgetQueue()  # Only populated in the service process
+
+
+class StaleWidget():
+    def __init__(self, params, trakt_api=None, cache=None):
+        """
+        Last items returned by Container.get_items for a widget path
+        Items are served without revalidating for a short time then served stale up to the list's
+        maximum staleness while a refresh of the path is queued for the service monitor
+        Items stored before the last Trakt activity or Kodi library change are never served
+        """
+        self.params = {k: v for k, v in params.items() if v is not None}
+        self.info = self.params.get('info') or ''
+        self.cache_name = get_cache_name(self.params)
+        self.trakt_api = trakt_api
+        self._cache = cache or BasicCache(filename=WIDGET_STALE)
+
+    @property
+    def max_stale(self):
+        """ Maximum hours the list can be served stale -- lists tied to watch state have lower limits """
+        try:
+            return self._max_stale
+        except AttributeError:
+            self._max_stale = 0 if self.info.startswith('random_') else get_setting('widgets_servestale_hours', 'int')
+            if self.info in WIDGET_STALE_LIMITS:
+                self._max_stale = min(self._max_stale, WIDGET_STALE_LIMITS[self.info])
+            return self._max_stale
+
+    @property
+    def stamp(self):
+        try:
+            return self._stamp
+        except AttributeError:
+            from tmdbhelper.lib.items.rendered import get_activity_stamp
+            self._stamp = get_activity_stamp(self.trakt_api)
+            return self._stamp
+
+    @property
+    def data(self):
+        try:
+            return self._data
+        except AttributeError:
+            self._data = self._cache.get_cache(self.cache_name) if self.max_stale else None
+            return self._data
+
+    @property
+    def is_current(self):
+        """ Stored items were built after the last Trakt activity and Kodi library change """
+        return bool(self.data and self.data.get('stamp') == self.stamp)
+
+    @property
+    def is_fresh(self):
+        return bool(self.is_current and get_timestamp(self.data.get('fresh_until')))
+
+    @property
+    def is_stale(self):
+        return bool(self.is_current and not self.is_fresh and get_timestamp(self.data.get('stale_until')))
+
+    def set_load(self, state, count=0):
+        notify_stale_load(self.params, state, count)
+
+    def get_items(self):
+        """ Returns stored items and container attributes if fresh or within max staleness otherwise None """
+        if self.is_fresh:
+            self.set_load('fresh', len(self.data['items']))
+            return self.data
+        if not self.is_stale:
+            return
+        self.set_load('stale', len(self.data['items']))  # Service queues a refresh of the path
+        return self.data
+
+    def set_items(self, items, container):
+        if not self.max_stale or not items:
+            return
+        if not all(isinstance(i, dict) for i in items):
+            return  # Only plain dict items can be stored
+        self._data = {
+            'stamp': self.stamp,
+            'fresh_until': set_timestamp(WIDGET_STALE_FRESH),
+            'stale_until': set_timestamp(self.max_stale * 3600),
+            'items': items,
+            'container': {k: getattr(container, k, None) for k in WIDGET_STALE_CONTAINER}}
+        self._cache.set_cache(self._data, self.cache_name, cache_days=CACHE_MEDIUM)
+        return self._data
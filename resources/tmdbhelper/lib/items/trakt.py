@@ -13,6 +13,9 @@ class TraktMethods():
         self._pauseplayprogress = pauseplayprogress  # Set play progress using paused at position
         self._watchedindicators = watchedindicators  # Set watched status and playcount
         self._unwatchedepisodes = unwatchedepisodes  # Set unwatched episode count to total episode count for unwatched tvshows
+        self._watched_shows = None  # Watched sync dict keyed by tmdb_id set in pre_sync
+        self._show_playcounts = {}  # Lookup tables of plays and watched/aired counts built once per show
+        self._episode_playprogress = None  # Lookup table of episode progress built in pre_sync
         if pauseplayprogress:
             lazyimport(globals(), 'tmdbhelper.lib.api.kodi.rpc', import_attr="set_playprogress")
 
@@ -22,6 +25,11 @@ class TraktMethods():
                 return self._trakt.get_movie_playprogress(
                     id_type='tmdb',
                     unique_id=try_int(li.unique_ids.get('tmdb')))
+            if self._episode_playprogress is not None:
+                return self._episode_playprogress.get((
+                    try_int(li.unique_ids.get('tvshow.tmdb')),
+                    try_int(li.infolabels.get('season'), fallback=-2),
+                    try_int(li.infolabels.get('episode'), fallback=-2)))
             return self._trakt.get_episode_playprogress(
                 id_type='tmdb',
                 unique_id=try_int(li.unique_ids.get('tvshow.tmdb')),
@@ -54,12 +62,45 @@ class TraktMethods():
             tmdbid = try_int(tmdb_id, fallback=None)
             season = try_int(season, fallback=-2)  # Use -2 to force all seasons lookup data on Trakt at seasons level
             if self._watchedindicators:
-                self._trakt.get_sync('watched', 'show', 'tmdb', extended='full')
+                self._watched_shows = self._trakt.get_sync('watched', 'show', 'tmdb', extended='full') or {}
                 if tmdbid:
                     self._trakt.get_episodes_airedcount(id_type='tmdb', unique_id=tmdbid, season=season)
-                    self._trakt.get_episodes_watchcount(id_type='tmdb', unique_id=tmdbid, season=season)
             if self._pauseplayprogress and tmdbid and season != -2:
-                self._trakt.get_sync('playback', 'show', 'tmdb')
+                self._episode_playprogress = self._trakt.get_episode_playprogress_table('tmdb')
+
+    def get_show_playcounts(self, unique_id):
+        """ Returns lookup table for show built from watched sync on first access or None if show not watched """
+        try:
+            return self._show_playcounts[unique_id]
+        except KeyError:
+            from tmdbhelper.lib.api.trakt.methods.progress import get_show_playcount_table
+            tvshow = self._watched_shows.get(unique_id)
+            self._show_playcounts[unique_id] = get_show_playcount_table(tvshow) if tvshow else None
+            return self._show_playcounts[unique_id]
+
+    def get_episode_playcount(self, unique_id, season, episode):
+        if self._watched_shows is None:
+            return self._trakt.get_episode_playcount(id_type='tmdb', unique_id=unique_id, season=season, episode=episode)
+        table = self.get_show_playcounts(unique_id)
+        if not table:
+            return
+        return table['plays'].get((try_int(season, fallback=-2), try_int(episode, fallback=-2)))
+
+    def get_episodes_watchcount(self, unique_id, season=None):
+        if self._watched_shows is None:
+            return self._trakt.get_episodes_watchcount(id_type='tmdb', unique_id=unique_id, season=season)
+        table = self.get_show_playcounts(unique_id)
+        if not table:
+            return
+        return table['watched'].get(try_int(season) if season is not None else None, 0)
+
+    def get_episodes_airedcount(self, unique_id, season=None):
+        if self._watched_shows is None or season is not None:
+            return self._trakt.get_episodes_airedcount(id_type='tmdb', unique_id=unique_id, season=season)
+        table = self.get_show_playcounts(unique_id)
+        if not table:
+            return
+        return table['aired']
 
     def get_playcount(self, li):
         if not self._watchedindicators:
@@ -69,30 +110,25 @@ class TraktMethods():
                 id_type='tmdb',
                 unique_id=try_int(li.unique_ids.get('tmdb'))) or 0
         if li.infolabels.get('mediatype') == 'episode':
-            return self._trakt.get_episode_playcount(
-                id_type='tmdb',
+            return self.get_episode_playcount(
                 unique_id=try_int(li.unique_ids.get('tvshow.tmdb')),
                 season=li.infolabels.get('season'),
                 episode=li.infolabels.get('episode')) or 0
         if li.infolabels.get('mediatype') == 'tvshow':
-            air_count = self._trakt.get_episodes_airedcount(
-                id_type='tmdb',
+            air_count = self.get_episodes_airedcount(
                 unique_id=try_int(li.unique_ids.get('tmdb')))
             if not air_count:
                 return None if self._unwatchedepisodes else 0
             li.infolabels['episode'] = air_count
-            return self._trakt.get_episodes_watchcount(
-                id_type='tmdb',
+            return self.get_episodes_watchcount(
                 unique_id=try_int(li.unique_ids.get('tmdb'))) or 0
         if li.infolabels.get('mediatype') == 'season':
-            air_count = self._trakt.get_episodes_airedcount(
-                id_type='tmdb',
+            air_count = self.get_episodes_airedcount(
                 unique_id=try_int(li.unique_ids.get('tvshow.tmdb') or li.unique_ids.get('tmdb')),
                 season=li.infolabels.get('season'))
             if not air_count:
                 return None if self._unwatchedepisodes else 0
             li.infolabels['episode'] = air_count
-            return self._trakt.get_episodes_watchcount(
-                id_type='tmdb',
+            return self.get_episodes_watchcount(
                 unique_id=try_int(li.unique_ids.get('tvshow.tmdb') or li.unique_ids.get('tmdb')),
                 season=li.infolabels.get('season')) or 0
@@ -19,10 +19,14 @@ class CronJobMonitor(Thread):
         self._do_delete_old_databases()
         self._do_recache_kodidb()
         self._do_trakt_authorization()
+        self._do_library_idmap_update()
 
     def _on_poll(self):
         self._do_library_update_check()
         self._do_trakt_lastactivities_update()
+        self._do_library_idmap_update()
+        self._do_airing_schedule_update()
+        self._do_widget_prewarm()
 
     @property
     def trakt_api(self):
@@ -60,6 +64,43 @@ class CronJobMonitor(Thread):
             return
         self.trakt_api.get_last_activity(cache_refresh=True)
 
+    def _do_widget_prewarm(self):
+        from tmdbhelper.lib.addon.plugin import get_setting
+        if not get_setting('widgets_servestale') or not get_setting('widgets_prewarm'):
+            return
+        from tmdbhelper.lib.monitor.widgets import WidgetPreWarmer
+        WidgetPreWarmer(self.xbmc_monitor, expiry=self._poll_time).run()
+
+    @staticmethod
+    def _do_library_idmap_update():
+        """ Resolve TMDb ids of library tvshows in background after the library version changes """
+        from tmdbhelper.lib.api.kodi.idmap import LibraryIDMap
+        from tmdbhelper.lib.api.kodi.rpc import get_kodi_library
+        from tmdbhelper.lib.items.rendered import get_library_version
+        from tmdbhelper.lib.addon.thread import BackgroundPriority
+        from tmdbhelper.lib.addon.logger import kodi_log
+        version = get_library_version()
+        idmap = LibraryIDMap('tv')
+        if not version or idmap.data['version'] == version:
+            return
+        kodi_db = get_kodi_library('tv', cache_refresh=True)
+        if not kodi_db or not kodi_db.database:
+            return
+        with BackgroundPriority():
+            resolved = idmap.refresh(kodi_db.database, version=version)
+        kodi_log(f'lib.monitor.cronjob - Library ID map resolved {resolved} tvshows', 2)
+
+    @staticmethod
+    def _do_airing_schedule_update():
+        """ Refetch next aired rows whose refresh time has passed so airing widgets only read the schedule """
+        from tmdbhelper.lib.api.tmdb.schedule import AiringSchedule, AIRING_SCHEDULE_LIMIT
+        from tmdbhelper.lib.addon.thread import BackgroundPriority
+        from tmdbhelper.lib.addon.logger import kodi_log
+        with BackgroundPriority():
+            updated = AiringSchedule('next_aired').update(limit=AIRING_SCHEDULE_LIMIT)
+        if updated:
+            kodi_log(f'lib.monitor.cronjob - Airing schedule refreshed {updated} tvshows', 2)
+
     def _do_library_update(self):
         from tmdbhelper.lib.addon.plugin import executebuiltin
         from tmdbhelper.lib.addon.tmdate import get_datetime_now, get_timedelta
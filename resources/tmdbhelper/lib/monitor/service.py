@@ -5,6 +5,7 @@ from tmdbhelper.lib.monitor.cronjob import CronJobMonitor
 from tmdbhelper.lib.monitor.listitem import ListItemMonitor
 from tmdbhelper.lib.monitor.player import PlayerMonitor
 from tmdbhelper.lib.monitor.update import UpdateMonitor
+from tmdbhelper.lib.monitor.widgets import WidgetMonitor
 from threading import Thread
 
 
@@ -21,6 +22,8 @@ class ServiceMonitor(object):
         self.listitem = None
         self.cron_job = CronJobMonitor(get_setting('library_autoupdate_hour', 'int'))
         self.cron_job.setName('Cron Thread')
+        self.widget_monitor = WidgetMonitor()
+        self.widget_monitor.setName('Widget Thread')
         self.player_monitor = None
         self.update_monitor = None
         self.listitem_monitor = ListItemMonitor()
@@ -82,6 +85,7 @@ class ServiceMonitor(object):
         while not self.xbmc_monitor.abortRequested() and not self.exit:
             if get_property('ServiceStop'):
                 self.cron_job.exit = True
+                self.widget_monitor.exit = True
                 self.exit = True
 
             # If we're in fullscreen video then we should update the playermonitor time
@@ -143,6 +147,7 @@ class ServiceMonitor(object):
     def run(self):
         get_property('ServiceStarted', 'True')
         self.cron_job.start()
+        self.widget_monitor.start()
         self.player_monitor = PlayerMonitor()
         self.update_monitor = UpdateMonitor()
         self.poller()
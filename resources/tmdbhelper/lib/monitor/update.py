@@ -1,5 +1,9 @@
 from xbmc import Monitor
 from tmdbhelper.lib.update.tagger import LibraryTagger
+from tmdbhelper.lib.items.rendered import set_library_version
+
+
+LIBRARY_UPDATE_METHODS = ['VideoLibrary.OnUpdate', 'VideoLibrary.OnRemove', 'VideoLibrary.OnCleanFinished']
 
 
 class UpdateMonitor(Monitor):
@@ -7,6 +11,15 @@ class UpdateMonitor(Monitor):
     Monitors updating Kodi library
     """
 
+    def __init__(self):
+        Monitor.__init__(self)
+        set_library_version()
+
+    def onNotification(self, sender, method, data):
+        if method in LIBRARY_UPDATE_METHODS:
+            set_library_version()
+
     def onScanFinished(self, library):
         if library == 'video':
+            set_library_version()
             LibraryTagger().run()
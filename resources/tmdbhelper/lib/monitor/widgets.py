@@ -0,0 +1,140 @@
+from threading import Thread
+from xbmc import Monitor
+
+
+WIDGET_POLL_TIME = 5
+
+
+def is_playback_active():
+    from tmdbhelper.lib.addon.plugin import get_condvisibility
+    return get_condvisibility("Player.HasVideo | System.ScreenSaverActive")
+
+
+class WidgetPreWarmer():
+    def __init__(self, xbmc_monitor, expiry=0):
+        """
+        Rebuilds the most requested widget paths whose stored items expire within expiry seconds
+        Stops when playback starts or the time budget for the poll is spent
+        """
+        self.xbmc_monitor = xbmc_monitor
+        self.expiry = expiry
+
+    def get_paths(self):
+        from tmdbhelper.lib.addon.tmdate import set_timestamp
+        from tmdbhelper.lib.addon.consts import WIDGET_PREWARM_ACTIVE, WIDGET_PREWARM_LIMIT
+        from tmdbhelper.lib.items.stale import StaleWidget, STALE_WIDGET_QUEUE
+        now = set_timestamp(0)
+        access = STALE_WIDGET_QUEUE.get_access(active=WIDGET_PREWARM_ACTIVE)
+
+        from tmdbhelper.lib.api.trakt.api import TraktAPI
+        trakt_api = TraktAPI()
+
+        paths = []
+        for i in sorted(access.values(), key=lambda i: i['count'], reverse=True):
+            widget = StaleWidget(i['params'], trakt_api)
+            if not widget.max_stale:
+                continue
+            if widget.is_current and widget.data['fresh_until'] > now + self.expiry:
+                continue
+            paths.append(i['params'])
+            if len(paths) >= WIDGET_PREWARM_LIMIT:
+                break
+        return paths
+
+    def run(self):
+        from time import monotonic
+        from tmdbhelper.lib.addon.consts import WIDGET_PREWARM_BUDGET
+        from tmdbhelper.lib.addon.logger import kodi_log
+        from tmdbhelper.lib.items.stale import STALE_WIDGET_QUEUE
+        from tmdbhelper.lib.api.revalidate import get_revalidate_report
+        budget = monotonic() + WIDGET_PREWARM_BUDGET
+        warmed = 0
+        for params in self.get_paths():
+            if self.xbmc_monitor.abortRequested() or is_playback_active() or monotonic() > budget:
+                break
+            try:
+                WidgetMonitor._do_container_refresh(params)
+                warmed += 1
+            except Exception as exc:
+                kodi_log(['lib.monitor.widgets - Widget pre-warm failed\n', params, '\n', exc], 1)
+            self.xbmc_monitor.waitForAbort(1)  # Spread out requests so pre-warming doesn't compete with UI
+        kodi_log([f'lib.monitor.widgets - Pre-warmed {warmed} widgets\n', STALE_WIDGET_QUEUE.get_hit_rate(), '\n', get_revalidate_report()], 2)
+
+
+class WidgetNotificationMonitor(Monitor):
+    """
+    Receives widget load notifications sent by plugin for the service owned stale widget queue
+    """
+
+    def onNotification(self, sender, method, data):
+        from tmdbhelper.lib.items.stale import STALE_WIDGET_QUEUE
+        STALE_WIDGET_QUEUE.on_notification(sender, method, data)
+
+
+class WidgetMonitor(Thread):
+
+    _poll_time = WIDGET_POLL_TIME
+
+    def __init__(self):
+        Thread.__init__(self)
+        self.exit = False
+        self.xbmc_monitor = WidgetNotificationMonitor()
+
+    def _on_poll(self):
+        if is_playback_active():
+            return
+        self._do_stale_refresh()
+        self._do_upnext_table_refresh()
+
+    def _do_stale_refresh(self):
+        """ Refresh widget paths queued after being served stale so next Container.Refresh gets new items """
+        from tmdbhelper.lib.items.stale import STALE_WIDGET_QUEUE
+        from tmdbhelper.lib.addon.logger import kodi_log
+        params = STALE_WIDGET_QUEUE.pop()
+        if not params:
+            return
+        try:
+            self._do_container_refresh(params)
+        except Exception as exc:
+            kodi_log(['lib.monitor.widgets - Stale widget refresh failed\n', params, '\n', exc], 1)
+            return
+        kodi_log(['lib.monitor.widgets - Refreshed stale widget\n', params, '\n', STALE_WIDGET_QUEUE.get_report()], 2)
+
+    @staticmethod
+    def _do_upnext_table_refresh():
+        """ Rebuild next episodes table queued by plugin after it served a stale table """
+        from jurialmunkey.parser import boolean
+        from jurialmunkey.window import get_property
+        from tmdbhelper.lib.api.trakt.methods.progress import UPNEXT_TABLE_QUEUE
+        if not get_property(UPNEXT_TABLE_QUEUE):
+            return
+        get_property(UPNEXT_TABLE_QUEUE, clear_property=True)
+        if not boolean(get_property('TraktIsAuth')):
+            return
+        from tmdbhelper.lib.api.trakt.api import TraktAPI
+        from tmdbhelper.lib.addon.thread import BackgroundPriority
+        from tmdbhelper.lib.addon.logger import kodi_log
+        try:
+            with BackgroundPriority():
+                TraktAPI().get_upnext_table(serve_stale=False)
+        except Exception as exc:
+            get_property(UPNEXT_TABLE_QUEUE, set_property='True')  # Queue again so rebuild is retried next poll
+            kodi_log(['lib.monitor.widgets - Next episodes table rebuild failed\n', exc], 1)
+
+    @staticmethod
+    def _do_container_refresh(params):
+        from tmdbhelper.lib.items.routes import get_container
+        from tmdbhelper.lib.addon.thread import BackgroundPriority
+        with BackgroundPriority():  # Requests yield to foreground plugin requests in the rate limiter
+            container = get_container(params.get('info'))(-1, '', **params)
+            container.stale_refresh = True
+            container.trakt_api.serve_stale = False  # Rebuild outdated next episodes table so it isn't stored as fresh
+            container.get_tmdb_id()
+            container.get_directory(items_only=True)
+
+    def run(self):
+        while not self.xbmc_monitor.abortRequested() and not self.exit:
+            self.xbmc_monitor.waitForAbort(self._poll_time)
+            self._on_poll()
+
+        del self.xbmc_monitor
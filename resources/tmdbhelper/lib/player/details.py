@@ -6,9 +6,9 @@ from tmdbhelper.lib.api.tmdb.api import TMDb
 EXTERNAL_ID_TYPES = ['tmdb', 'tvdb', 'imdb', 'slug', 'trakt']
 
 
-def get_next_episodes(tmdb_id, season, episode, player=None):
-    from tmdbhelper.lib.addon.thread import ParallelThread
-    tmdb_api = TMDb()
+def _get_next_episodes_list(tmdb_api, tmdb_id, season, episode, play_bundle=None):
+    if play_bundle and play_bundle.get('next_episodes'):
+        return play_bundle.get('next_episodes')
 
     all_episodes = tmdb_api.get_flatseasons_list(tmdb_id)
     if not all_episodes:
@@ -26,6 +26,16 @@ def get_next_episodes(tmdb_id, season, episode, player=None):
         return False
 
     nxt_episodes = [i for i in all_episodes if _is_future_ep(i)]
+    if nxt_episodes and play_bundle:
+        play_bundle.set_next_episodes(nxt_episodes)
+    return nxt_episodes
+
+
+def get_next_episodes(tmdb_id, season, episode, player=None, play_bundle=None):
+    from tmdbhelper.lib.addon.thread import ParallelThread
+    tmdb_api = TMDb()
+
+    nxt_episodes = _get_next_episodes_list(tmdb_api, tmdb_id, season, episode, play_bundle=play_bundle)
     if not nxt_episodes:
         return
 
@@ -48,7 +58,16 @@ def get_next_episodes(tmdb_id, season, episode, player=None):
     return [i for i in item_queue if i]
 
 
-def get_external_ids(tmdb_type, tmdb_id, season=None, episode=None):
+def get_external_ids(tmdb_type, tmdb_id, season=None, episode=None, play_bundle=None):
+    if play_bundle and play_bundle.has_external_ids:
+        return play_bundle.get_external_ids()
+    external_ids = _get_external_ids(tmdb_type, tmdb_id, season=season, episode=episode)
+    if external_ids and play_bundle:
+        play_bundle.set_unique_ids(external_ids['unique_ids'])
+    return external_ids
+
+
+def _get_external_ids(tmdb_type, tmdb_id, season=None, episode=None):
     from tmdbhelper.lib.api.trakt.api import TraktAPI
     trakt_api = TraktAPI()
     trakt_type = 'movie' if tmdb_type == 'movie' else 'show'
@@ -126,10 +145,13 @@ def _get_language_item(tmdb_type, tmdb_id, season=None, episode=None, language=N
     return item
 
 
-def get_language_details(base, tmdb_type, tmdb_id, season=None, episode=None, language=None, year=None):
+def get_language_details(base, tmdb_type, tmdb_id, season=None, episode=None, language=None, year=None, play_bundle=None):
     if not language:
         return base
-    item = _get_language_item(tmdb_type, tmdb_id, season, episode, language, year)
+    item = play_bundle.get_language(language) if play_bundle else None
+    if not item:
+        item = _get_language_item(tmdb_type, tmdb_id, season, episode, language, year)
+        play_bundle.set_language(language, item) if play_bundle else None
     if not item:
         return base
     item = {k: v or base.get(k) for k, v in item.items()}  # Fallback to default key in base if translation is empty
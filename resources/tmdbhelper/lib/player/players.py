@@ -11,6 +11,40 @@ from tmdbhelper.lib.api.kodi.rpc import get_directory, KodiLibrary
 from tmdbhelper.lib.player.inputter import KeyboardInputter
 from tmdbhelper.lib.addon.logger import kodi_log
 from threading import Thread
+from timeit import default_timer as timer
+
+
+class PlayerProbe(Thread):
+    def __init__(self, players, player):
+        """ Thread to resolve the path of a player so that fallback players can be probed concurrently """
+        from copy import copy, deepcopy
+        Thread.__init__(self, daemon=True)  # Never keep plugin interpreter alive for a probe nobody is waiting on
+        self.players = copy(players)  # Shallow copy so that each probe keeps its own action log
+        self.players.action_log = []
+        self.players.player_probe = self
+        self.actions = deepcopy(player['actions'])  # Actions are popped during resolving so don't modify originals
+        self.timer_a = timer()
+        self.cancelled = False
+        self.path = None
+
+    @property
+    def action_log(self):
+        return self.players.action_log
+
+    def run(self):
+        self.path = self.players._get_path_from_actions(self.actions)
+
+    def cancel(self):
+        self.cancelled = True
+
+    def get_path(self, timeout):
+        """ Wait for remaining time of timeout from when probe was created and return path """
+        self.join(max(0, self.timer_a + timeout - timer()))
+        if self.is_alive():
+            self.cancel()
+            self.players.action_log += ('TIMEOUT!', '\n')
+            return
+        return self.path
 
 
 class PlayerHacks():
@@ -311,7 +345,7 @@ class PlayerMethods():
 class PlayerDetails():
     def get_external_ids(self):
         from tmdbhelper.lib.player.details import get_external_ids
-        self._external_ids = get_external_ids(self.tmdb_type, self.tmdb_id, season=self.season, episode=self.episode)
+        self._external_ids = get_external_ids(self.tmdb_type, self.tmdb_id, season=self.season, episode=self.episode, play_bundle=self.play_bundle)
         return self._external_ids
 
     def get_item_details(self, language=None):
@@ -326,12 +360,16 @@ class PlayerDetails():
 
     def get_language_details(self, language=None, year=None):
         from tmdbhelper.lib.player.details import get_language_details
-        self._item = get_language_details(self.item, self.tmdb_type, self.tmdb_id, self.season, self.episode, language=language, year=year)
+        self._item = get_language_details(
+            self.item, self.tmdb_type, self.tmdb_id, self.season, self.episode, language=language, year=year,
+            play_bundle=self.play_bundle)
         return self._item
 
     def get_next_episodes(self):
         from tmdbhelper.lib.player.details import get_next_episodes
-        self._next_episodes = get_next_episodes(self.tmdb_id, self.season, self.episode, self.current_player['file'])
+        self._next_episodes = get_next_episodes(
+            self.tmdb_id, self.season, self.episode, self.current_player['file'],
+            play_bundle=self.play_bundle)
         return self._next_episodes
 
     def get_playerstring(self):
@@ -346,8 +384,10 @@ class PlayerProperties():
         try:
             return self._players
         except AttributeError:
-            from tmdbhelper.lib.player.putils import get_players_from_file
-            self._players = get_players_from_file()
+            from tmdbhelper.lib.player.putils import PlayerRegistry
+            registry = PlayerRegistry()
+            self._players = registry.get_players()
+            self.action_log += ('REGSTR: ', registry.get_report(), '\n')
             return self._players
 
     @property
@@ -433,6 +473,23 @@ class PlayerProperties():
             self._thread_external_ids = Thread(target=self.get_external_ids)
             return self._thread_external_ids
 
+    @property
+    def play_bundle(self):
+        try:
+            return self._play_bundle
+        except AttributeError:
+            from tmdbhelper.lib.files.pcache import PlayBundle
+            self._play_bundle = PlayBundle(self.tmdb_type, self.tmdb_id, self.season, self.episode)
+            return self._play_bundle
+
+    @property
+    def player_probes(self):
+        try:
+            return self._player_probes
+        except AttributeError:
+            self._player_probes = {}
+            return self._player_probes
+
     @property
     def p_dialog(self):
         try:
@@ -446,6 +503,7 @@ class PlayerProperties():
 class Players(PlayerProperties, PlayerDetails, PlayerMethods, PlayerHacks):
 
     TMDB_TYPE_CONVERSION = {'season': 'tv', 'episode': 'tv'}
+    player_probe = None
 
     def __init__(self, tmdb_type, tmdb_id=None, season=None, episode=None, ignore_default='', islocal=False, player=None, mode=None, **kwargs):
 
@@ -453,6 +511,7 @@ class Players(PlayerProperties, PlayerDetails, PlayerMethods, PlayerHacks):
         # Otherwise the busy dialog will prevent window activation for folder path
         executebuiltin('Dialog.Close(busydialog)')
 
+        self.timer_a = timer()
         self.action_log = []
         self.api_language = None
         self.tmdb_type = self.TMDB_TYPE_CONVERSION.get(tmdb_type, tmdb_type)
@@ -460,6 +519,7 @@ class Players(PlayerProperties, PlayerDetails, PlayerMethods, PlayerHacks):
         self.season = season
         self.episode = episode
 
+        self.action_log += ('BUNDLE: ', 'HIT' if self.play_bundle.data else 'MISS', '\n')
         self.force_recache_kodidb_hack()  # Check if user wants to force rebuilding Kodi library cache first in case of new items
         self.thread_external_ids.start()  # We thread this lookup and rejoin later as Trakt might be slow and we dont want to delay if unneeded
         self.get_playerstring()  # Get our playerstring at start because we want the details we set to match the unomdified details (TODO: Check if we do?)
@@ -471,6 +531,10 @@ class Players(PlayerProperties, PlayerDetails, PlayerMethods, PlayerHacks):
         self.dummy_duration = try_float(get_setting('dummy_duration', 'str')) or 1.0
         self.dummy_delay = try_float(get_setting('dummy_delay', 'str')) or 1.0
 
+        self.race_players = get_setting('race_players')
+        self.race_players_count = get_setting('race_players_count', 'int') or 3
+        self.race_players_timeout = get_setting('race_players_timeout', 'int') or 20
+
         self.is_strm = islocal
         self.current_player = {}
 
@@ -525,6 +589,7 @@ class Players(PlayerProperties, PlayerDetails, PlayerMethods, PlayerHacks):
             'plugin_icon': f'{ADDONPATH}/resources/icons/other/kodi.png'}]
         dialog_players += self.dialog_players
 
+        self.action_log += ('LATNCY: ', f'{timer() - self.timer_a:.3f} sec to dialog', '\n')
         x = _select_combined() if combined else _select_standard()
         if x == -1:
             return {}
@@ -664,6 +729,10 @@ class Players(PlayerProperties, PlayerDetails, PlayerMethods, PlayerHacks):
         if not is_folder:
             return path
         for action in actions[1:]:
+            # Stop probing if another player already resolved or probe timed out
+            if self.player_probe and self.player_probe.cancelled:
+                return
+
             # Start thread with keyboard inputter if needed
             if action.get('keyboard'):
                 if action['keyboard'] in ['Up', 'Down', 'Left', 'Right', 'Select']:
@@ -736,10 +805,66 @@ class Players(PlayerProperties, PlayerDetails, PlayerMethods, PlayerHacks):
         if not actions:
             return
         if isinstance(actions, list):
+            if self.race_players:
+                return self._get_path_from_race(player)
             return self._get_path_from_actions(actions)
         if isinstance(actions, str):
             return (self.string_format_map(actions), player.get('is_folder', False))  # Single path so return it formatted
 
+    def _is_raceable_player(self, player):
+        """ Players can only be probed concurrently if they don't need user input or different item details """
+        actions = player.get('actions')
+        if not actions or not isinstance(actions, list):
+            return False
+        if player.get('language') or player.get('api_language', None) != self.api_language:
+            return False
+        for action in actions[1:]:
+            if action.get('keyboard') or action.get('dialog'):
+                return False
+        return True
+
+    def _get_player_chain(self, player):
+        """ Returns list of player followed by its fallbacks up to the race count """
+        chain = [player]
+        while len(chain) < self.race_players_count and chain[-1].get('fallback'):
+            fallback = self._get_player_or_fallback(chain[-1]['fallback'])
+            if not fallback or fallback in chain:
+                break
+            chain.append(fallback)
+        return chain
+
+    def _set_player_probes(self, player):
+        """ Start probes for player and its fallbacks which can be probed concurrently """
+        chain = [i for i in self._get_player_chain(player) if self._is_raceable_player(i)]
+        self.set_external_ids(required=any(i.get('requires_ids') for i in chain))
+        for i in chain:
+            key = (i.get('file'), i.get('mode'))
+            if key in self.player_probes:
+                continue
+            self.player_probes[key] = PlayerProbe(self, i)
+            self.player_probes[key].start()
+            self.action_log += ('PROBE!: ', i.get('file'), ' ', i.get('mode'), '\n')
+
+    def _del_player_probes(self):
+        for probe in self.player_probes.values():
+            probe.cancel()
+        self.player_probes.clear()
+
+    def _get_path_from_race(self, player):
+        """ Returns tuple of (path, is_folder) from probe of player while also probing its fallbacks """
+        key = (player.get('file'), player.get('mode'))
+        if key not in self.player_probes:
+            self._set_player_probes(player)
+        probe = self.player_probes.pop(key, None)
+        if not probe:
+            path = self._get_path_from_actions(player['actions'])
+        else:
+            path = probe.get_path(self.race_players_timeout)
+            self.action_log += probe.action_log
+        if path:
+            self._del_player_probes()  # Found a path so cancel remaining probes
+        return path
+
     def get_default_player(self):
         """ Returns default player """
 
@@ -835,6 +960,7 @@ class Players(PlayerProperties, PlayerDetails, PlayerMethods, PlayerHacks):
             return
         get_property('PlayerInfoString', clear_property=True)
         path = self._get_resolved_path(allow_default=True) or {}
+        self._del_player_probes()  # Player chain finished so stop any fallback probes still running
         if return_listitem:
             self.details.params = {}
             self.details.path = path.pop('url', None)
@@ -20,38 +20,156 @@ def make_upnext(current_episode, next_episode):
     AddonSignals.sendSignal('upnext_data', next_info, source_id='plugin.video.themoviedb.helper')
 
 
-def get_players_from_file():
-    from json import loads
-    from tmdbhelper.lib.files.futils import get_files_in_folder, read_file
-    from tmdbhelper.lib.addon.plugin import get_setting, get_condvisibility
-    from tmdbhelper.lib.addon.consts import PLAYERS_BASEDIR_BUNDLED, PLAYERS_BASEDIR_USER, PLAYERS_BASEDIR_SAVE, PLAYERS_REQUIRED_IDS
-    from tmdbhelper.lib.addon.thread import ParallelThread
-
-    basedirs = [PLAYERS_BASEDIR_USER]
-    if get_setting('bundled_players'):
-        basedirs += [PLAYERS_BASEDIR_BUNDLED]
-    basedirs += [PLAYERS_BASEDIR_SAVE]  # Add saved players last so they overwrite
-
-    def _threaditem(file):
-        data = read_file(basedir + file)
+class PlayerRegistry():
+    """
+    Compiled registry of player files cached to disk
+    Stamped with the mtime of every player file and the set of enabled plugins
+    Unchanged files are reused from the registry so only modified files are read and parsed again
+    """
+
+    def __init__(self):
+        from tmdbhelper.lib.addon.plugin import get_setting
+        from tmdbhelper.lib.addon.consts import PLAYERS_BASEDIR_BUNDLED, PLAYERS_BASEDIR_USER, PLAYERS_BASEDIR_SAVE
+        self.basedirs = [PLAYERS_BASEDIR_USER]
+        if get_setting('bundled_players'):
+            self.basedirs += [PLAYERS_BASEDIR_BUNDLED]
+        self.basedirs += [PLAYERS_BASEDIR_SAVE]  # Add saved players last so they overwrite
+        self.files_cached = 0
+        self.files_parsed = 0
+        self.time_saved = 0
+        self.time_taken = 0
+        self.is_compiled = False
+
+    @staticmethod
+    def get_mtime(filepath):
+        from xbmcvfs import Stat
+        return Stat(filepath).st_mtime()
+
+    @staticmethod
+    def get_enabled_addons():
+        """ Get set of enabled addon ids in a single JSON-RPC call rather than checking each plugin """
+        from tmdbhelper.lib.api.kodi.rpc import get_jsonrpc
+        try:
+            return {i['addonid'] for i in get_jsonrpc('Addons.GetAddons', {'enabled': True})['result']['addons']}
+        except (KeyError, TypeError, AttributeError):
+            return
+
+    @staticmethod
+    def get_enabled_stamp(enabled_addons):
+        from hashlib import md5
+        return md5('\n'.join(sorted(enabled_addons)).encode('utf-8')).hexdigest()
+
+    def get_stamp(self):
+        """ Get dictionary of {filepath: mtime} for all player files in basedirs """
+        from tmdbhelper.lib.files.futils import get_files_in_folder
+        return {
+            f'{basedir}{file}': self.get_mtime(f'{basedir}{file}')
+            for basedir in self.basedirs
+            for file in get_files_in_folder(basedir, r'.*\.json')}
+
+    @staticmethod
+    def get_entry(filepath):
+        """ Read and parse a single player file into a registry entry """
+        from json import loads
+        from timeit import default_timer as timer
+        from tmdbhelper.lib.files.futils import read_file
+        from tmdbhelper.lib.addon.consts import PLAYERS_REQUIRED_IDS
+        timer_a = timer()
+        data = read_file(filepath)
         meta = loads(data) or {}
         plugins = meta.get('plugin') or 'plugin.undefined'  # Give dummy name to undefined plugins so that they fail the check
         plugins = plugins if isinstance(plugins, list) else [plugins]  # Listify for simplicity of code
-        for i in plugins:
-            if not get_condvisibility(f'System.AddonIsEnabled({i})'):
-                return (None, None, )  # System doesn't have a required plugin so skip this player
-        else:
-            for _id in PLAYERS_REQUIRED_IDS:
-                if _id in data:
-                    meta['requires_ids'] = True
-                    break
-            meta['plugin'] = plugins[0]
-            return (file, meta,)
-
-    players = {}
-    for basedir in basedirs:
-        files = get_files_in_folder(basedir, r'.*\.json')
-        with ParallelThread(files, _threaditem) as pt:
+        for _id in PLAYERS_REQUIRED_IDS:
+            if _id in data:
+                meta['requires_ids'] = True
+                break
+        meta['plugin'] = plugins[0]
+        return {'meta': meta, 'plugins': plugins, 'cost': timer() - timer_a}
+
+    def get_entries(self, stamp, registry):
+        """ Reuse registry entries for files with unchanged mtime and parse the rest in parallel """
+        from tmdbhelper.lib.addon.thread import ParallelThread
+        cached_stamp = registry.get('stamp') or {}
+        cached_entries = registry.get('entries') or {}
+        entries = {}
+        modified = []
+        for filepath, mtime in stamp.items():
+            if filepath in cached_entries and cached_stamp.get(filepath) == mtime:
+                entries[filepath] = cached_entries[filepath]
+                self.time_saved += entries[filepath].get('cost', 0)
+                continue
+            modified.append(filepath)
+
+        def _threaditem(filepath):
+            try:
+                return (filepath, self.get_entry(filepath), )
+            except ValueError:  # Malformed player file so skip it
+                return (filepath, None, )
+
+        with ParallelThread(modified, _threaditem) as pt:
             item_queue = pt.queue
-        players.update({k: v for k, v in item_queue if k and v})
-    return players
+        entries.update({k: v for k, v in item_queue if k and v})
+        self.files_cached = len(stamp) - len(modified)
+        self.files_parsed = len(modified)
+        return entries
+
+    def get_compiled(self, stamp, entries, enabled_addons=None):
+        """ Filter entries to players with enabled plugins in basedir order so that later basedirs overwrite """
+        from tmdbhelper.lib.addon.plugin import get_condvisibility
+
+        def _is_enabled(plugin):
+            if enabled_addons is not None:
+                return plugin in enabled_addons
+            return get_condvisibility(f'System.AddonIsEnabled({plugin})')
+
+        players = {}
+        for filepath in stamp:
+            entry = entries.get(filepath)
+            if not entry or not all(_is_enabled(i) for i in entry['plugins']):
+                continue  # System doesn't have a required plugin so skip this player
+            players[filepath.rsplit('/', 1)[-1]] = entry['meta']
+        return players
+
+    def get_players(self):
+        from timeit import default_timer as timer
+        from tmdbhelper.lib.files.futils import get_json_filecache, set_json_filecache
+        from tmdbhelper.lib.addon.consts import PLAYERS_REGISTRY_FILENAME, PLAYERS_REGISTRY_VERSION
+
+        timer_a = timer()
+        stamp = self.get_stamp()
+        enabled_addons = self.get_enabled_addons()
+        enabled_stamp = self.get_enabled_stamp(enabled_addons) if enabled_addons is not None else None
+
+        registry = get_json_filecache(PLAYERS_REGISTRY_FILENAME) or {}
+        if registry.get('version') != PLAYERS_REGISTRY_VERSION:
+            registry = {}
+
+        # Nothing changed since registry was compiled so return compiled players in one read
+        if enabled_stamp and registry.get('stamp') == stamp and registry.get('enabled') == enabled_stamp:
+            self.is_compiled = True
+            self.files_cached = len(stamp)
+            self.time_saved = sum(v.get('cost', 0) for v in registry.get('entries', {}).values())
+            self.time_taken = timer() - timer_a
+            return registry.get('players') or {}
+
+        entries = self.get_entries(stamp, registry)
+        players = self.get_compiled(stamp, entries, enabled_addons)
+        set_json_filecache({
+            'version': PLAYERS_REGISTRY_VERSION,
+            'stamp': stamp,
+            'enabled': enabled_stamp,
+            'entries': entries,
+            'players': players}, PLAYERS_REGISTRY_FILENAME, cache_days=0)
+        self.time_taken = timer() - timer_a
+        return players
+
+    def get_report(self):
+        status = 'compiled' if self.is_compiled else 'rebuilt'
+        return (
+            f'{status} '
+            f'{self.files_cached} cached {self.files_parsed} parsed '
+            f'{self.time_taken:.3f} sec taken {self.time_saved:.3f} sec saved')
+
+
+def get_players_from_file():
+    return PlayerRegistry().get_players()